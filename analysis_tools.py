@@ -3,11 +3,14 @@ This module contains all information concerning the tools that are used by softw
 """
 
 import collections
-import copy
+import concurrent.futures
 import enum
+import functools
+import itertools
 import os
 import re
 import subprocess
+import threading
 
 import scoring
 import util
@@ -19,6 +22,14 @@ from tools_info import TOOLS
 
 Tool = collections.namedtuple('Tool', ['exe_name', 'install_name', 'install_via'])
 VIA = enum.Enum('VIA', 'PACKAGE_MANAGER PIP DOWNLOAD')
+# What AnalysisTool.run() returns: the list of scores, the textual score description (for console output), and whether
+# the analysis was successful
+AnalysisResult = collections.namedtuple('AnalysisResult', ['scores', 'log', 'success'])
+
+# The tools run concurrently, and some of them run their own subprocesses in parallel on top of that. All of these
+# nested subprocesses share one limit, so that together they do not oversubscribe the cores.
+MAX_PARALLEL_SUBPROCESSES = min(7, os.cpu_count() or 4)
+_subprocess_slots = threading.BoundedSemaphore(MAX_PARALLEL_SUBPROCESSES)
 
 
 class AnalysisTool:
@@ -31,9 +42,10 @@ class AnalysisTool:
         Executes the analysis tool and returns a score.
         :param data: dictionary containing all relevant data (such as file paths and lines of code)
         :param skip_on_failure: automatically skip the tool on error or raise exceptions
-        :return: list of scores, textual score description (for console output), True - if analysis was successful
+        :return: An AnalysisResult: list of scores, textual score description (for console output), True - if
+        analysis was successful
         """
-        return [], "", False
+        return AnalysisResult([], "", False)
 
     @staticmethod
     def name():
@@ -69,29 +81,7 @@ class CompileTool(AnalysisTool):
         :param excluded_paths: A tuple containing the paths to be excluded.
         :return: The compiler score.
         """
-        command_file = args.commandfile
-
-        if args.make:
-            if command_file:
-                score = compile_phase.compile_program_make(program_dir_abs, lines_of_code, compiler_flags,
-                                                           excluded_paths,
-                                                           make_command_file=command_file[0])
-            else:
-                score = compile_phase.compile_program_make(program_dir_abs, lines_of_code, compiler_flags,
-                                                           excluded_paths)
-        elif args.clang:
-            score = compile_phase.compile_program_clang(program_dir_abs, args.clang, lines_of_code, compiler_flags,
-                                                        excluded_paths, cpp)
-        else:
-            if command_file:
-                score = compile_phase.compile_program_cmake(program_dir_abs, lines_of_code, compiler_flags,
-                                                            excluded_paths,
-                                                            make_command_file=command_file[0])
-            else:
-                score = compile_phase.compile_program_cmake(program_dir_abs, lines_of_code, compiler_flags,
-                                                            excluded_paths)
-
-        return score
+        return compile_phase.compile_program(args, program_dir_abs, lines_of_code, cpp, compiler_flags, excluded_paths)
 
     @staticmethod
     def name():
@@ -100,10 +90,13 @@ class CompileTool(AnalysisTool):
 
 class AssertionTool(AnalysisTool):
     @staticmethod
-    def is_assert(line, custom_asserts=None):
+    @functools.lru_cache(maxsize=8)
+    def get_assertion_regex(custom_asserts=()):
         """
-        Check whether a line of code contains an assertion. Finds both C assert() calls and C++ static_assert().
-        :return: True if there is an assertion, else False.
+        Get the compiled regex that matches a line of code containing an assertion. It is compiled only once per set of
+        custom asserts instead of being looked up in the re module's cache for every line.
+        :param custom_asserts: A tuple of custom assertion names to look for in addition to assert and static_assert.
+        :return: The compiled regex.
         """
         # This regex should match all ways in which assertions could occur.
         # It spits out false positives for ultra specific cases: when someone literally puts "assert(" in a string or
@@ -118,7 +111,39 @@ class AssertionTool(AnalysisTool):
 
         regex = r'(?!^.*\/\/.*(assert' + custom + r')\s*\()(?!^.*\/\*.*(assert' + custom + \
                 r')\s*\()^.*(\W|^)((static_)?assert' + custom + r')\s*\('
-        return re.match(regex, line)
+        return re.compile(regex)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def get_assertion_check(custom_asserts=()):
+        """
+        Get a function that checks whether a line of code contains an assertion, like the match method of
+        get_assertion_regex(), but cheaper on the lines without any assertion.
+        :param custom_asserts: A tuple of custom assertion names to look for in addition to assert and static_assert.
+        :return: A function that takes a line and returns a match object if it contains an assertion, else None.
+        """
+        match = AssertionTool.get_assertion_regex(custom_asserts).match
+        if not all(re.fullmatch(r'\w+', custom_assert) for custom_assert in custom_asserts):
+            return match  # Custom asserts that are regex patterns cannot be looked for as plain substrings
+        names = ('assert',) + custom_asserts  # static_assert contains assert
+
+        def check(line):
+            # Every line the regex matches contains one of the names. Most lines contain none of them, which a substring
+            # search finds out much faster than the regex with its backtracking lookaheads.
+            for name in names:
+                if name in line:
+                    return match(line)
+            return None
+
+        return check
+
+    @staticmethod
+    def is_assert(line, custom_asserts=None):
+        """
+        Check whether a line of code contains an assertion. Finds both C assert() calls and C++ static_assert().
+        :return: True if there is an assertion, else False.
+        """
+        return AssertionTool.get_assertion_check(tuple(custom_asserts or ()))(line)
 
     @staticmethod
     def run(data, skip_on_failure=False):
@@ -127,15 +152,12 @@ class AssertionTool(AnalysisTool):
         custom_asserts = data["custom_asserts"]
 
         assert_count = 0
+        is_assert = AssertionTool.get_assertion_check(tuple(custom_asserts or ()))
 
         for path in source_files:
-            file = open(path, 'r', encoding='latin-1')
-
-            file_lines = file.readlines()
-            for line in file_lines:
-                if AssertionTool.is_assert(line, custom_asserts):
+            for line in util.read_source_file_lines(path):
+                if is_assert(line):
                     assert_count += 1
-            file.close()
 
         assertion_rate = assert_count / lines_of_code
 
@@ -152,7 +174,7 @@ class AssertionTool(AnalysisTool):
         log += strings.DETAILLED_RESULTS_WRITTEN_INTO.format(strings.RESULTS_FILENAME_ASSERTION_CHECK) + "\n"
         log += scoring.get_score_string(score, 'Assertion') + "\n"
 
-        return [score], log, True
+        return AnalysisResult([score], log, True)
 
     @staticmethod
     def name():
@@ -192,17 +214,15 @@ class ClangTidyTool(AnalysisTool):
         :return: weighted warning count
         """
         warning_count = 0
+        clang_tidy_warnings = classifications.CLANG_TIDY_WARNINGS
+        line_is_warning_line = compile_phase.line_is_warning_line
 
         for line in warning_lines:
-            if compile_phase.line_is_warning_line(line):
-                warning_name = line.split()[-1][1:-1]
-                warning_category = warning_name.split('-')[0]
-
-                warning_level = 1
-                if warning_category in classifications.CLANG_TIDY_WARNINGS:
-                    warning_level = classifications.CLANG_TIDY_WARNINGS[warning_category]
+            if line_is_warning_line(line):
+                warning_name = line.rsplit(None, 1)[-1][1:-1]  # The last word is "[category-name]"
+                warning_category = warning_name.partition('-')[0]
 
-                warning_count += warning_level
+                warning_count += clang_tidy_warnings.get(warning_category, 1)
 
         return warning_count
 
@@ -221,6 +241,34 @@ class ClangTidyTool(AnalysisTool):
 
         return beautified_lines
 
+    @staticmethod
+    def run_on_file_block(file_block, clang_tidy_options, num_tries):
+        """
+        Runs clang-tidy on one block of source files.
+        :param file_block: The lst of source files to analyze.
+        :param clang_tidy_options: The clang-tidy options that follow the source files in the call.
+        :param num_tries: The amount of times clang-tidy should be rerun if it runs into internal problems
+        :return: The output of clang-tidy.
+        """
+        clang_tidy_call = [TOOLS.CLANG_TIDY.exe_name]
+        clang_tidy_call.extend(file_block)
+        clang_tidy_call.extend(clang_tidy_options)
+
+        for i in range(num_tries):
+            try:
+                with _subprocess_slots:
+                    return subprocess.check_output(clang_tidy_call, universal_newlines=True, stderr=subprocess.STDOUT)
+            except subprocess.CalledProcessError as error:
+                # clang-tidy seems to run into segfaults sometimes, so rerun it if that happens
+                if error.returncode == -11:
+                    if i == num_tries - 1:
+                        raise
+                else:
+                    # clang-tidy can exit with exit code 1 if there is no compilation database, which might be the
+                    # case when compiling with just clang. Thus, ignore the exception here.
+                    return error.output
+        return ""
+
     @staticmethod
     def run(data, skip_on_failure=False, num_tries=5):
         program_dir_abs = data["program_dir_abs"]
@@ -240,41 +288,22 @@ class ClangTidyTool(AnalysisTool):
         """
         n = 100
         file_blocks = util.split_in_chunks(source_files, n)
-        concat_output = ""
-
-        for file_block in file_blocks:
-            clang_tidy_call = [TOOLS.CLANG_TIDY.exe_name]
-            clang_tidy_call.extend(file_block)
-
-            # Create checks lst
-            clang_tidy_checks = strings.CLANG_TIDY_CHECKS_CPP if cpp else strings.CLANG_TIDY_CHECKS_C
-            clang_tidy_call.append('-checks=' + clang_tidy_checks)
-            clang_tidy_call.extend(['-p', program_dir_abs])
-
-            for i in range(num_tries):
-                try:
-                    output = subprocess.check_output(clang_tidy_call, universal_newlines=True, stderr=subprocess.STDOUT)
-                    concat_output += output
-                    break
-                except subprocess.CalledProcessError as error:
-                    if error.returncode == -11:
-                        if i == num_tries-1:
-                            if not skip_on_failure:
-                                raise
-                            return [0], "", False
-                    else:
-                        output = error.output
-                        concat_output += output
-                        break
-                    #if error.returncode == -11:  # clang-tidy seems to run into segfaults sometimes, so rerun it if that happens
-                    #    return ClangTidyTool.run(data, num_tries=num_tries - 1)
-
-                    # clang-tidy can exit with exit code 1 if there is no compilation database, which might be the case when
-                    # compiling with just clang. Thus, ignore the exception here.
-                except Exception:  # catch the rest and exclude the analysis tool from the score
-                    if not skip_on_failure:
-                        raise
-                    return [0], "", False
+
+        # Create checks lst
+        clang_tidy_checks = strings.CLANG_TIDY_CHECKS_CPP if cpp else strings.CLANG_TIDY_CHECKS_C
+        clang_tidy_options = ['-checks=' + clang_tidy_checks, '-p', program_dir_abs]
+
+        # The file blocks are independent, so clang-tidy is run on them in parallel. The outputs are concatenated in the
+        # order of the blocks.
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_PARALLEL_SUBPROCESSES) as executor:
+                outputs = list(executor.map(ClangTidyTool.run_on_file_block, file_blocks,
+                                            itertools.repeat(clang_tidy_options), itertools.repeat(num_tries)))
+        except Exception:  # catch the rest and exclude the analysis tool from the score
+            if not skip_on_failure:
+                raise
+            return AnalysisResult([0], "", False)
+        concat_output = ''.join(outputs)
 
         warning_lines = ClangTidyTool.get_warning_lines(concat_output)
         weighted_warning_count = ClangTidyTool.get_weighted_warning_count(warning_lines)
@@ -291,7 +320,7 @@ class ClangTidyTool(AnalysisTool):
         log += strings.DETAILLED_RESULTS_WRITTEN_INTO.format(strings.RESULTS_FILENAME_CLANG_TIDY) + "\n"
         log += scoring.get_score_string(score, 'Clang-tidy') + "\n"
 
-        return [score], log, True
+        return AnalysisResult([score], log, True)
 
     @staticmethod
     def name():
@@ -366,7 +395,7 @@ class LizardTool(AnalysisTool):
         except Exception:  # catch the rest and exclude the analysis tool from the score
             if not skip_on_failure:
                 raise
-            return [0, 0, 0], "", False
+            return AnalysisResult([0, 0, 0], "", False)
 
         lizard_output = LizardTool.filter_output(output)
         cyclomatic_complexity_score, warning_score, unique_score, temp = \
@@ -377,7 +406,7 @@ class LizardTool(AnalysisTool):
         log += strings.DETAILLED_RESULTS_WRITTEN_INTO.format(strings.RESULTS_FILENAME_LIZARD) + "\n"
         log += temp
 
-        return [cyclomatic_complexity_score, warning_score, unique_score], log, True
+        return AnalysisResult([cyclomatic_complexity_score, warning_score, unique_score], log, True)
 
     @staticmethod
     def name():
@@ -408,28 +437,23 @@ class CppcheckTool(AnalysisTool):
         # TODO: find out the purpose of the --template=cppcheck1' which broke the output
         cppcheck_call = [TOOLS.CPPCHECK.exe_name, '--enable=all', '--force', '--language=' + language, "-v"]
 
-        output = ""
-        chunk_size = 100  # should fix that "OSError: [Errno 7] Argument lst too long: 'cppcheck'" thing
-
         try:
-            argument_chunks = util.split_in_chunks(source_files, chunk_size)
-            for chunk in argument_chunks:
-                temp_call = copy.deepcopy(cppcheck_call)   # TODO: check this again
-                temp_call.extend(chunk)
-                output += subprocess.check_output(temp_call, universal_newlines=True,
-                                                  stderr=subprocess.STDOUT, encoding='utf-8', errors='ignore') + "\n"
+            # Pass the source files via a file list, which avoids the "OSError: [Errno 7] Argument list too long"
+            # problem without having to call cppcheck once per chunk of files
+            cppcheck_call.append('--file-list=' + util.get_file_list_file(tuple(source_files)))
+            output = subprocess.check_output(cppcheck_call, universal_newlines=True,
+                                             stderr=subprocess.STDOUT, encoding='utf-8', errors='ignore') + "\n"
             warning_lines = CppcheckTool.get_warning_lines(output)
             cppcheck_output = output_classes.CppcheckOutput(warning_lines)
         except subprocess.CalledProcessError as error:
-            print("cppcheck failed!")
-            print(strings.COMPILATION_CRASHED.format(error.returncode, error.output))
             if not skip_on_failure:
                 raise
-            return [0], "", False
+            log = "cppcheck failed!\n" + strings.COMPILATION_CRASHED.format(error.returncode, error.output) + "\n"
+            return AnalysisResult([0], log, False)
         except Exception:  # catch the rest and exclude the analysis tool from the score
             if not skip_on_failure:
                 raise
-            return [0], "", False
+            return AnalysisResult([0], "", False)
 
         weighted_cppcheck_rate, temp = cppcheck_output.get_information(lines_of_code)
         util.write_into_file_list(strings.RESULTS_FILENAME_CPPCHECK, warning_lines)
@@ -441,7 +465,7 @@ class CppcheckTool(AnalysisTool):
         log += strings.DETAILLED_RESULTS_WRITTEN_INTO.format(strings.RESULTS_FILENAME_CPPCHECK) + "\n"
         log += scoring.get_score_string(score, 'Cppcheck') + "\n"
 
-        return [score], log, True
+        return AnalysisResult([score], log, True)
 
     @staticmethod
     def name():
@@ -465,31 +489,43 @@ class KWStyleTool(AnalysisTool):
 
         return warning_count
 
+    @staticmethod
+    def run_on_file(kwstyle_call, source_file):
+        """
+        Runs KWStyle on a single source file.
+        :param kwstyle_call: The KWStyle call without the input file.
+        :param source_file: The source file to check.
+        :return: The output of KWStyle.
+        """
+        cur_kwstyle_call = kwstyle_call[::]
+        cur_kwstyle_call.append(source_file)
+        try:
+            with _subprocess_slots:
+                return subprocess.check_output(cur_kwstyle_call, universal_newlines=True, stderr=subprocess.STDOUT)
+        except subprocess.CalledProcessError as error:
+            # Same as with the lizard call. KWStyle exits with status 1 by default.
+            # So catch that, ignore the exception, and keep the output of the command
+            return error.output
+
     @staticmethod
     def run(data, skip_on_failure=False):
         source_files = data["source_files"]
         lines_of_code = data["lines_of_code"]
 
-        softwipe_directory = os.path.dirname(os.path.realpath(__file__))
-        kwstyle_xml = os.path.join(softwipe_directory, 'KWStyle.xml')
+        kwstyle_xml = os.path.join(util.get_softwipe_directory(), 'KWStyle.xml')
         kwstyle_call = [TOOLS.KWSTYLE.exe_name, '-v', '-xml', kwstyle_xml]
 
-        output = ''
-        # KWStyle only works properly when specifying just one single input file. Thus, iterate and call KWStyle again
-        # for each source file, each time appending to the result output.
-        for source_file in source_files:
-            cur_kwstyle_call = kwstyle_call[::]
-            cur_kwstyle_call.append(source_file)
-            try:
-                output += subprocess.check_output(cur_kwstyle_call, universal_newlines=True, stderr=subprocess.STDOUT)
-            except subprocess.CalledProcessError as error:
-                # Same as with the lizard call. KWStyle exits with status 1 by default.
-                # So catch that, ignore the exception, and keep the output of the command
-                output += error.output
-            except Exception:  # catch the rest and exclude the analysis tool from the score
-                if not skip_on_failure:
-                    raise
-                return [0], "", False
+        # KWStyle only works properly when specifying just one single input file. Thus, call KWStyle once for each
+        # source file. The calls are independent, so they are run in parallel, and the outputs are concatenated in
+        # the order of the source files.
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_PARALLEL_SUBPROCESSES) as executor:
+                outputs = list(executor.map(KWStyleTool.run_on_file, itertools.repeat(kwstyle_call), source_files))
+        except Exception:  # catch the rest and exclude the analysis tool from the score
+            if not skip_on_failure:
+                raise
+            return AnalysisResult([0], "", False)
+        output = ''.join(outputs)
 
         warning_count = KWStyleTool.get_warning_count(output)
         warning_rate = warning_count / lines_of_code
@@ -503,7 +539,7 @@ class KWStyleTool(AnalysisTool):
         log += strings.DETAILLED_RESULTS_WRITTEN_INTO.format(strings.RESULTS_FILENAME_KWSTYLE) + "\n"
         log += scoring.get_score_string(score, 'KWStyle') + "\n"
 
-        return [score], log, True
+        return AnalysisResult([score], log, True)
 
     @staticmethod
     def name():
@@ -569,8 +605,8 @@ class InferTool(AnalysisTool):
         Compile the program with infer using cmake to allow infer to analyze it later.
         :param program_dir_abs: The absolute path to the root directory of the target program.
         :param excluded_paths: A lst containing files to be excluded.
-        :return: True if the compilation was successful
-                 False if the compilation was not successful
+        :return: 1. True if the compilation was successful, False if not
+                 2. The error message if the compilation was not successful, else an empty string
         """
         build_path = util.create_build_directory(program_dir_abs, build_dir_name="infer_build")
         util.clear_directory(build_path)
@@ -588,11 +624,10 @@ class InferTool(AnalysisTool):
         except subprocess.CalledProcessError as e:
             util.write_into_file_string(strings.ERROR_FILENAME_INFER_COMPILATION,
                                         strings.INFER_COMPILATION_CRASHED.format(e.returncode, e.output))
-            print(strings.INFER_COMPILATION_CRASHED.format(e.returncode, strings.ERROR_LOG_WRITTEN_INTO.format(
-                strings.ERROR_FILENAME_INFER_COMPILATION)))
-            print()
-            return False
-        return True
+            # Returned instead of printed, as Infer may run while the compiler output is printed
+            return False, strings.INFER_COMPILATION_CRASHED.format(e.returncode, strings.ERROR_LOG_WRITTEN_INTO.format(
+                strings.ERROR_FILENAME_INFER_COMPILATION)) + "\n"
+        return True, ""
 
     @staticmethod
     def compile_with_make(program_dir_abs, excluded_paths):
@@ -600,8 +635,8 @@ class InferTool(AnalysisTool):
         Compile the program with infer using make to allow infer to analyze it later.
         :param program_dir_abs: The absolute path to the root directory of the target program.
         :param excluded_paths: A lst containing files to be excluded.
-        :return: True if the compilation was successful
-                 False if the compilation was not successful
+        :return: 1. True if the compilation was successful, False if not
+                 2. The error message if the compilation was not successful, else an empty string
         """
         exclude_args = InferTool.prepare_exclude_arguments(program_dir_abs, excluded_paths)
         infer_call = [TOOLS.INFER.exe_name, "capture"]
@@ -620,11 +655,10 @@ class InferTool(AnalysisTool):
         except subprocess.CalledProcessError as e:
             util.write_into_file_string(strings.ERROR_FILENAME_INFER_COMPILATION,
                                         strings.INFER_COMPILATION_CRASHED.format(e.returncode, e.output))
-            print(strings.INFER_COMPILATION_CRASHED.format(e.returncode, strings.ERROR_LOG_WRITTEN_INTO.format(
-                strings.ERROR_FILENAME_INFER_COMPILATION)))
-            print()
-            return False
-        return True
+            # Returned instead of printed, as Infer may run while the compiler output is printed
+            return False, strings.INFER_COMPILATION_CRASHED.format(e.returncode, strings.ERROR_LOG_WRITTEN_INTO.format(
+                strings.ERROR_FILENAME_INFER_COMPILATION)) + "\n"
+        return True, ""
 
     @staticmethod
     def run(data, skip_on_failure=False):
@@ -633,16 +667,16 @@ class InferTool(AnalysisTool):
         use_cmake = data["use_cmake"]
         use_make = data["use_make"]
         excluded_paths = data["excluded_paths"]
-        compilation_status = False
+        compilation_status, compilation_log = False, ""
 
         if use_cmake:
             program_dir_abs += "/" + strings.INFER_BUILD_DIR_NAME
-            compilation_status = InferTool.compile_with_cmake(program_dir_abs, excluded_paths)
+            compilation_status, compilation_log = InferTool.compile_with_cmake(program_dir_abs, excluded_paths)
         elif use_make:
-            compilation_status = InferTool.compile_with_make(program_dir_abs, excluded_paths)
+            compilation_status, compilation_log = InferTool.compile_with_make(program_dir_abs, excluded_paths)
 
         if not compilation_status:
-            return [0], "", False
+            return AnalysisResult([0], compilation_log, False)
 
         # TODO: maybe fix the error handling differently (not by the --keep-going flag)
         infer_analyze = [TOOLS.INFER.exe_name, "analyze", "--keep-going"]
@@ -651,22 +685,21 @@ class InferTool(AnalysisTool):
             subprocess.check_output(infer_analyze, cwd=program_dir_abs, universal_newlines=True,
                                     stderr=subprocess.STDOUT)
         except subprocess.CalledProcessError as error:
-            print(strings.COMPILATION_CRASHED.format(error.returncode, error.output))
-            template = "An exception of type {0} occurred. Arguments:\n{1!r}"
-            message = template.format(type(error).__name__, error.args)
-            print(message)
             if not skip_on_failure:
                 raise
-            return [0], "", False
+            template = "An exception of type {0} occurred. Arguments:\n{1!r}"
+            log = strings.COMPILATION_CRASHED.format(error.returncode, error.output) + "\n"
+            log += template.format(type(error).__name__, error.args) + "\n"
+            return AnalysisResult([0], log, False)
         except Exception:  # catch the rest and exclude the analysis tool from the score
             if not skip_on_failure:
                 raise
-            return [0], "", False
+            return AnalysisResult([0], "", False)
 
         infer_out_path = util.find_file(program_dir_abs, strings.INFER_OUTPUT_FILE_NAME,
                                         directory=strings.INFER_OUTPUT_DIR_NAME)
         if infer_out_path == "":
-            return [0], "Could not find {}".format(strings.INFER_OUTPUT_FILE_NAME), False
+            return AnalysisResult([0], "Could not find {}".format(strings.INFER_OUTPUT_FILE_NAME), False)
 
         file_out, warnings, warning_num = InferTool.get_warnings_from_output(infer_out_path)
         util.write_into_file_string(strings.RESULTS_FILENAME_INFER, file_out)
@@ -681,7 +714,7 @@ class InferTool(AnalysisTool):
                                                                 lines_of_code) + "\n"
         log += scoring.get_score_string(score, 'Infer') + "\n"
 
-        return [score], log, True
+        return AnalysisResult([score], log, True)
 
     @staticmethod
     def name():
@@ -728,9 +761,7 @@ class ValgrindTool(AnalysisTool):
         print(program_dir_abs)
 
         if executefile and os.path.isfile(executefile):
-            file = open(executefile, 'r')
-            lines = file.readlines()
-            file.close()
+            lines = util.read_text(executefile).splitlines()
 
             command_line = os.path.join(program_dir_abs, lines[0])
             command.extend(command_line.split())
@@ -744,7 +775,7 @@ class ValgrindTool(AnalysisTool):
         except FileNotFoundError as e1:
             print(e1)
             print(strings.EXECUTION_FILE_NOT_FOUND.format(command[1]))
-            return [], "", False
+            return AnalysisResult([], "", False)
         except subprocess.CalledProcessError as error:
             if error.returncode == 123:
                 pass
@@ -767,7 +798,7 @@ class ValgrindTool(AnalysisTool):
         log += scoring.get_score_string(score, ValgrindTool.name()) + "\n"
         log += strings.DETAILLED_RESULTS_WRITTEN_INTO.format(strings.RESULTS_FILENAME_VALGRIND)
 
-        return [score], log, True
+        return AnalysisResult([score], log, True)
 
     @staticmethod
     def name():
@@ -778,20 +809,17 @@ class TestCountTool(AnalysisTool):
     @staticmethod
     def run(data, skip_on_failure=False):
         loc = data["lines_of_code"]
-        source_files = data["source_files"]
-
-        source_files_wo_tests = [x for x in source_files if not util.is_testfile(x)]
-        loc_wo_tests = util.count_lines_of_code(source_files_wo_tests)
+        test_loc = data["lines_of_test_code"]
 
-        rate = (loc - loc_wo_tests) / loc
+        rate = test_loc / loc
         score = scoring.calculate_testcount_score_absolute(rate)
 
         log = " --- TEST COUNT --- \n"
         log += strings.LINES_OF_PURE_CODE_ARE.format(loc) + "\n"
-        log += "Amount of unit test LOC compared to overall LOC: {} ({}/{})\n".format(rate, (loc - loc_wo_tests), loc)
+        log += "Amount of unit test LOC compared to overall LOC: {} ({}/{})\n".format(rate, test_loc, loc)
         log += scoring.get_score_string(score, TestCountTool.name()) + "\n"
 
-        return [score], log, True
+        return AnalysisResult([score], log, True)
 
     @staticmethod
     def name():
@@ -4,6 +4,7 @@ Functions related to the automatic installation of dependencies.
 
 import inspect
 import os
+import pickle
 import platform
 import shutil
 import subprocess
@@ -14,6 +15,8 @@ import strings
 import tools_info
 import util
 
+TOOLS_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'softwipe', 'tools.pkl')
+
 
 def detect_user_os():
     """
@@ -182,19 +185,64 @@ def auto_install_prompt(missing_tools, package_install_command):
             print('Please answer with "Y" (Yes) or "n" (no)!')
 
 
-def check_if_all_required_tools_are_installed():
+def get_tools_cache_key(tools):
+    """
+    Get the key under which the result of the tool check is cached. The tools are looked up in the PATH, so the
+    result stays valid as long as the PATH and the contents of its directories (and, of course, the list of required
+    tools and the machine) do not change.
+    :param tools: The tools to check, as a list of Tool namedtuples.
+    :return: The cache key.
+    """
+    path = os.environ.get('PATH', '')
+    path_dir_mtimes = []
+    for path_dir in path.split(os.pathsep):
+        try:
+            path_dir_mtimes.append(os.stat(path_dir).st_mtime_ns)
+        except OSError:
+            path_dir_mtimes.append(None)
+    return path, tuple(path_dir_mtimes), platform.node(), tuple(tool.exe_name for tool in tools)
+
+
+def read_tools_cache():
+    try:
+        with open(TOOLS_CACHE_FILE, 'rb') as file:
+            return pickle.load(file)
+    except Exception:  # A missing or broken cache simply means that the tools have to be checked
+        return None
+
+
+def write_tools_cache(cache_key):
+    try:
+        os.makedirs(os.path.dirname(TOOLS_CACHE_FILE), exist_ok=True)
+        tmp_path = '{}.{}.tmp'.format(TOOLS_CACHE_FILE, os.getpid())
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(cache_key, file)
+        os.replace(tmp_path, TOOLS_CACHE_FILE)  # atomic, so concurrent softwipe runs never read a partial file
+    except OSError:  # Not being able to cache the result is no reason to fail
+        pass
+
+
+def check_if_all_required_tools_are_installed(use_cache=False):
     """
     Check if clang etc. (all the tools used in the pipeline) are installed on the system and can be used. If
     something is missing, print a warning and exit.
+    :param use_cache: If True, skip the check if a previous check with the same PATH found all tools, and remember a
+    successful check for later runs.
     """
-    tools = [tool for tool in inspect.getmembers(tools_info.TOOLS) if not tool[0].startswith('_')
+    tools = [tool[1] for tool in inspect.getmembers(tools_info.TOOLS) if not tool[0].startswith('_')
              and 'infer' not in tool[1].exe_name]
+
+    if use_cache:
+        cache_key = get_tools_cache_key(tools)
+        if read_tools_cache() == cache_key:
+            return
+
     missing_tools = []
     for tool in tools:
-        which_result = shutil.which(tool[1].exe_name)
+        which_result = shutil.which(tool.exe_name)
         if which_result is None:  # if the tool is not installed / not accessible
-            missing_tools.append(tool[1])
-            print("missing: {}".format(tool[1].exe_name))
+            missing_tools.append(tool)
+            print("missing: {}".format(tool.exe_name))
 
     if missing_tools:
         print_missing_tools(missing_tools)
@@ -205,3 +253,5 @@ def check_if_all_required_tools_are_installed():
         #    sys.exit(1)
 
         auto_install_prompt(missing_tools, package_install_command)
+    elif use_cache:
+        write_tools_cache(cache_key)
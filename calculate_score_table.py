@@ -7,7 +7,12 @@ all scores.
 """
 
 import argparse
+import collections
+import concurrent.futures
+import functools
 import os
+import re
+import sys
 
 import scoring
 
@@ -52,6 +57,34 @@ SCORE_KEYS = [LOC_KEY, FUNCTIONS_KEY, COMPILER_KEY, SANITIZER_KEY, COMPILER_AND_
               CPPCHECK_KEY, CLANG_TIDY_KEY, CYCLOMATIC_COMPLEXITY_KEY, LIZARD_WARNINGS_KEY,
               UNIQUE_KEY, KWSTYLE_KEY, INFER_KEY]
 
+# The tools that can fail, i.e. that can be missing from a softwipe output. None is always reported as failed. While
+# parsing, the failed tools are kept as a bitmask with one bit per tool (in this order).
+TOOL_KEYS = [COMPILER_KEY, SANITIZER_KEY, COMPILER_AND_SANITIZER_KEY, INFER_KEY, ASSERTIONS_KEY, CPPCHECK_KEY,
+             CLANG_TIDY_KEY, CYCLOMATIC_COMPLEXITY_KEY, LIZARD_WARNINGS_KEY, UNIQUE_KEY, KWSTYLE_KEY, TESTCOUNT_KEY,
+             None]
+ALL_TOOLS_MASK = (1 << len(TOOL_KEYS)) - 1
+
+
+def get_tools_mask(*tools):
+    """
+    Get the bitmask of some tools.
+    :param tools: Keys from TOOL_KEYS.
+    :return: The bitmask with the bits of the tools set.
+    """
+    mask = 0
+    for tool in tools:
+        mask |= 1 << TOOL_KEYS.index(tool)
+    return mask
+
+
+def get_tools_from_mask(mask):
+    """
+    Get the tools whose bits are set in a bitmask.
+    :param mask: The bitmask.
+    :return: A set containing the keys of the tools.
+    """
+    return {tool for i, tool in enumerate(TOOL_KEYS) if mask & (1 << i)}
+
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Calculate the code quality benchmark (i.e., the scores) and output "
@@ -72,174 +105,187 @@ def parse_arguments():
     return args
 
 
-def get_result_rates(result_directory, folder):
+def compile_line_prefix_regex(prefixes):
+    """
+    Compile a regex that matches any of the prefixes, followed by a colon, at the start of a line. The matched prefix is
+    group 1 and the first word after the colon is group 2, so a rate can be parsed straight from the match without
+    splitting the line. The regex is multiline, so finditer() on a whole file finds the lines with a known prefix
+    without looping over the other lines in Python.
+    :param prefixes: The line prefixes, without the colon.
+    :return: The compiled regex.
+    """
+    return re.compile('^(' + '|'.join(re.escape(prefix) for prefix in prefixes) + r'):[ \t]*(\S*)', re.MULTILINE)
+
+
+# For each line of the softwipe output that contains a rate: The key the rate belongs to and the bitmask of the tools
+# that the line shows to have run. The rate is always the first word after the colon. Lines are looked up by their
+# prefix before the colon.
+RATE_LINES = {
+    'Weighted compiler warning rate': (COMPILER_AND_SANITIZER_KEY,
+                                       get_tools_mask(COMPILER_KEY, COMPILER_AND_SANITIZER_KEY)),
+    'AddressSanitizer error rate': (COMPILER_AND_SANITIZER_KEY, get_tools_mask(SANITIZER_KEY)),
+    'UndefinedBehaviorSanitizer error rate': (COMPILER_AND_SANITIZER_KEY, get_tools_mask(SANITIZER_KEY)),
+    'Assertion rate': (ASSERTIONS_KEY, get_tools_mask(ASSERTIONS_KEY, COMPILER_AND_SANITIZER_KEY)),
+    'Total weighted Cppcheck warning rate': (CPPCHECK_KEY, get_tools_mask(CPPCHECK_KEY)),
+    'Weighted Clang-tidy warning rate': (CLANG_TIDY_KEY, get_tools_mask(CLANG_TIDY_KEY)),
+    'Average cyclomatic complexity': (CYCLOMATIC_COMPLEXITY_KEY, get_tools_mask(CYCLOMATIC_COMPLEXITY_KEY)),
+    'Lizard warning rate (~= rate of functions that are too complex)': (LIZARD_WARNINGS_KEY,
+                                                                        get_tools_mask(LIZARD_WARNINGS_KEY)),
+    'Unique code rate': (UNIQUE_KEY, get_tools_mask(UNIQUE_KEY)),
+    'KWStyle warning rate': (KWSTYLE_KEY, get_tools_mask(KWSTYLE_KEY)),
+    'Weighted Infer warning rate': (INFER_KEY, get_tools_mask(INFER_KEY)),
+    'Amount of unit test LOC compared to overall LOC': (TESTCOUNT_KEY, get_tools_mask(TESTCOUNT_KEY)),
+}
+
+
+def get_absolute_value(abs_by_loc):
+    # abs_by_loc looks like "(<absolute>/<loc>)"; slice out the number instead of splitting the string
+    return int(abs_by_loc[1:abs_by_loc.index('/')])
+
+
+def get_functions_value(abs_by_loc):
+    return int(abs_by_loc[abs_by_loc.index('/') + 1:-1])
+
+
+# For each line of the softwipe output that contains an absolute value: The key the value belongs to, the function that
+# parses the value from the last word of the line, and the bitmask of the tools that the line shows to have run. Lines
+# are looked up by their prefix before the colon.
+VALUE_LINES = {
+    'Lines of pure code (LOC, excludes blank and comment lines)': (LOC_KEY, int, 0),
+    'Weighted compiler warning rate': (COMPILER_KEY, get_absolute_value,
+                                       get_tools_mask(COMPILER_KEY, COMPILER_AND_SANITIZER_KEY)),
+    'AddressSanitizer error rate': (SANITIZER_KEY, get_absolute_value,
+                                    get_tools_mask(SANITIZER_KEY, COMPILER_AND_SANITIZER_KEY)),
+    'UndefinedBehaviorSanitizer error rate': (SANITIZER_KEY, get_absolute_value,
+                                              get_tools_mask(SANITIZER_KEY, COMPILER_AND_SANITIZER_KEY)),
+    'Assertion rate': (ASSERTIONS_KEY, get_absolute_value, get_tools_mask(ASSERTIONS_KEY)),
+    'Total weighted Cppcheck warning rate': (CPPCHECK_KEY, get_absolute_value, get_tools_mask(CPPCHECK_KEY)),
+    'Weighted Clang-tidy warning rate': (CLANG_TIDY_KEY, get_absolute_value, get_tools_mask(CLANG_TIDY_KEY)),
+    'Average cyclomatic complexity': (CYCLOMATIC_COMPLEXITY_KEY, float, get_tools_mask(CYCLOMATIC_COMPLEXITY_KEY)),
+    'Lizard warning rate (~= rate of functions that are too complex)': (LIZARD_WARNINGS_KEY, get_absolute_value,
+                                                                        get_tools_mask(LIZARD_WARNINGS_KEY)),
+    'Unique code rate': (UNIQUE_KEY, float, get_tools_mask(UNIQUE_KEY)),
+    'KWStyle warning rate': (KWSTYLE_KEY, get_absolute_value, get_tools_mask(KWSTYLE_KEY)),
+    'Weighted Infer warning rate': (INFER_KEY, get_absolute_value, get_tools_mask(INFER_KEY)),
+    'Amount of unit test LOC compared to overall LOC': (TESTCOUNT_KEY, get_absolute_value,
+                                                        get_tools_mask(TESTCOUNT_KEY)),
+}
+VALUE_LINE_REGEX = compile_line_prefix_regex(VALUE_LINES)
+
+
+# What parse_softwipe_output() returns: The rates and the absolute values found in the softwipe output, each as a dict
+# with the keys defined above, together with the bitmask of the tools that failed according to the respective view
+ParsedOutput = collections.namedtuple('ParsedOutput', ['rates', 'rates_failed_tools', 'values',
+                                                       'values_failed_tools'])
+
+
+@functools.lru_cache(maxsize=None)
+def parse_softwipe_output(result_directory, folder):
+    """
+    Parse the rates and the absolute values from the softwipe output of one program in a single pass over the file. The
+    result is cached, so get_result_rates() and get_result_values() share one read of each file.
+    :param result_directory: The directory containing all result folders.
+    :param folder: The result folder of the program.
+    :return: A ParsedOutput.
+    """
     cur_folder = os.path.join(result_directory, folder)
     cur_file = os.path.join(cur_folder, SOFTWIPE_OUTPUT_FILE_NAME)
-    cur_lines = open(cur_file, 'r').readlines()  # Softwipe output lines
+    with open(cur_file, 'r') as file:
+        output = file.read()
 
     # Init
-    compiler_and_sanitizer_rate = 0.0  # Special treatment because we may have to add multiple values for this score
-    assertion_rate = cppcheck_rate = clang_tidy_rate = ccn = lizard_rate = unique_rate = kwstyle_rate = infer_rate = \
-        test_count_rate = None
-
-    # fill the failed_tools lst with all the available analysis tools and remove the ones that are not available in the report
-    # this allows accepting half-finished reports without provoking reading or calculation errors
-    failed_tools = [COMPILER_KEY, SANITIZER_KEY, COMPILER_AND_SANITIZER_KEY, INFER_KEY, ASSERTIONS_KEY, CPPCHECK_KEY,
-                    CLANG_TIDY_KEY, CYCLOMATIC_COMPLEXITY_KEY, LIZARD_WARNINGS_KEY, UNIQUE_KEY, KWSTYLE_KEY,
-                    TESTCOUNT_KEY, None]
-
-    # Iterate through the softwipe output
-    for line in cur_lines:
-        split_line = line.split()
-
-        # Compiler and sanitizer rate treatment
-        if line.startswith('Weighted compiler warning rate:'):
-            compiler_and_sanitizer_rate += float(split_line[4])
-            if COMPILER_KEY in failed_tools: failed_tools.remove(COMPILER_KEY)
-            if COMPILER_AND_SANITIZER_KEY in failed_tools: failed_tools.remove(COMPILER_AND_SANITIZER_KEY)
-        elif line.startswith(('AddressSanitizer error rate:', 'UndefinedBehaviorSanitizer error rate:')):
-            compiler_and_sanitizer_rate += float(split_line[3])
-            if SANITIZER_KEY in failed_tools: failed_tools.remove(SANITIZER_KEY)
-
-        # All other rates
-        elif line.startswith('Assertion rate:'):
-            assertion_rate = float(split_line[2])
-            if ASSERTIONS_KEY in failed_tools: failed_tools.remove(ASSERTIONS_KEY)
-            if COMPILER_AND_SANITIZER_KEY in failed_tools: failed_tools.remove(COMPILER_AND_SANITIZER_KEY)
-        elif line.startswith('Total weighted Cppcheck warning rate:'):
-            cppcheck_rate = float(split_line[5])
-            if CPPCHECK_KEY in failed_tools: failed_tools.remove(CPPCHECK_KEY)
-        elif line.startswith('Weighted Clang-tidy warning rate:'):
-            clang_tidy_rate = float(split_line[4])
-            if CLANG_TIDY_KEY in failed_tools: failed_tools.remove(CLANG_TIDY_KEY)
-        elif line.startswith('Average cyclomatic complexity:'):
-            ccn = float(split_line[3])
-            if CYCLOMATIC_COMPLEXITY_KEY in failed_tools: failed_tools.remove(CYCLOMATIC_COMPLEXITY_KEY)
-        elif line.startswith('Lizard warning rate (~= rate of functions that are too complex):'):
-            lizard_rate = float(split_line[11])
-            if LIZARD_WARNINGS_KEY in failed_tools: failed_tools.remove(LIZARD_WARNINGS_KEY)
-        elif line.startswith('Unique code rate:'):
-            unique_rate = float(split_line[3])
-            if UNIQUE_KEY in failed_tools: failed_tools.remove(UNIQUE_KEY)
-        elif line.startswith('KWStyle warning rate:'):
-            kwstyle_rate = float(split_line[3])
-            if KWSTYLE_KEY in failed_tools: failed_tools.remove(KWSTYLE_KEY)
-        elif line.startswith('Weighted Infer warning rate:'):
-            infer_rate = float(split_line[4])
-            if INFER_KEY in failed_tools: failed_tools.remove(INFER_KEY)
-        elif line.startswith('Amount of unit test LOC compared to overall LOC:'):
-            test_count_rate = float(split_line[-2])
-            if TESTCOUNT_KEY in failed_tools: failed_tools.remove(TESTCOUNT_KEY)
-
-    return compiler_and_sanitizer_rate, assertion_rate, cppcheck_rate, clang_tidy_rate, ccn, lizard_rate, \
-           unique_rate, kwstyle_rate, infer_rate, test_count_rate, failed_tools
+    rates = dict.fromkeys([ASSERTIONS_KEY, CPPCHECK_KEY, CLANG_TIDY_KEY, CYCLOMATIC_COMPLEXITY_KEY, LIZARD_WARNINGS_KEY,
+                           UNIQUE_KEY, KWSTYLE_KEY, INFER_KEY, TESTCOUNT_KEY])
+    # Special treatment because we may have to add multiple values for this score
+    rates[COMPILER_AND_SANITIZER_KEY] = 0.0
+    values = dict.fromkeys([LOC_KEY, FUNCTIONS_KEY, COMPILER_KEY, ASSERTIONS_KEY, CPPCHECK_KEY, CLANG_TIDY_KEY,
+                            CYCLOMATIC_COMPLEXITY_KEY, LIZARD_WARNINGS_KEY, UNIQUE_KEY, KWSTYLE_KEY, INFER_KEY,
+                            TESTCOUNT_KEY])
+    values[SANITIZER_KEY] = 0  # The warnings of both sanitizers are added up
+
+    # Start with all the available analysis tools marked as failed and clear the ones that are found in the report.
+    # This allows accepting half-finished reports without provoking reading or calculation errors.
+    rates_failed_tools = values_failed_tools = ALL_TOOLS_MASK
+
+    # Iterate through the lines of the softwipe output that have a known prefix. Every line with a rate also contains a
+    # value, so the value lines cover both.
+    for match in VALUE_LINE_REGEX.finditer(output):
+        prefix = match.group(1)
+        line_end = output.find('\n', match.end())
+        line = output[match.start():] if line_end == -1 else output[match.start():line_end]
+
+        rate_line = RATE_LINES.get(prefix)
+        if rate_line is not None:
+            key, found_tools_mask = rate_line
+            rate = float(match.group(2))
+            if key == COMPILER_AND_SANITIZER_KEY:
+                rates[key] += rate
+            else:
+                rates[key] = rate
+            rates_failed_tools &= ~found_tools_mask
+
+        key, parse_value, found_tools_mask = VALUE_LINES[prefix]
+        if key == LOC_KEY and values[LOC_KEY]:  # Only the first lines of code count is the one of the whole program
+            continue
+        last_word = line.rsplit(None, 1)[-1]  # Only the last word of the line holds the value
+        value = parse_value(last_word)
+        if key == SANITIZER_KEY:
+            values[key] += value
+        else:
+            values[key] = value
+        if key == LIZARD_WARNINGS_KEY:
+            values[FUNCTIONS_KEY] = get_functions_value(last_word)
+        values_failed_tools &= ~found_tools_mask
 
+    return ParsedOutput(rates, rates_failed_tools, values, values_failed_tools)
 
-def get_result_values(result_directory, folder):
-    def get_absolute_value(abs_by_loc):
-        return int(abs_by_loc.split('/')[0][1:])
 
-    cur_folder = os.path.join(result_directory, folder)
-    cur_file = os.path.join(cur_folder, SOFTWIPE_OUTPUT_FILE_NAME)
-    cur_lines = open(cur_file, 'r').readlines()  # Softwipe output lines
+def get_result_rates(result_directory, folder):
+    parsed_output = parse_softwipe_output(result_directory, folder)
+    rates = parsed_output.rates
 
-    # Init
-    sanitizer_warnings = 0
-    loc = functions = compiler_warnings = assertions = cppcheck_warnings = clang_tidy_warnings = \
-        ccn = lizard_warnings = unique = kwstyle_warnings = infer_warnings = test_count_loc = None
-
-    failed_tools = [COMPILER_KEY, SANITIZER_KEY, INFER_KEY, ASSERTIONS_KEY, CPPCHECK_KEY, COMPILER_AND_SANITIZER_KEY,
-                    CLANG_TIDY_KEY, CYCLOMATIC_COMPLEXITY_KEY, LIZARD_WARNINGS_KEY, UNIQUE_KEY, KWSTYLE_KEY,
-                    TESTCOUNT_KEY, None]
-
-    # Iterate through the softwipe output
-    for line in cur_lines:
-        split_line = line.split()
-
-        if line.startswith('Lines of pure') and not loc:
-            loc = int(split_line[-1])
-        elif line.startswith('Weighted compiler warning rate:'):
-            compiler_warnings = get_absolute_value(split_line[-1])
-            if COMPILER_KEY in failed_tools: failed_tools.remove(COMPILER_KEY)
-            if COMPILER_AND_SANITIZER_KEY in failed_tools: failed_tools.remove(COMPILER_AND_SANITIZER_KEY)
-        elif line.startswith(('AddressSanitizer error rate:', 'UndefinedBehaviorSanitizer error rate:')):
-            sanitizer_warnings += get_absolute_value(split_line[-1])
-            if SANITIZER_KEY in failed_tools: failed_tools.remove(SANITIZER_KEY)
-            if COMPILER_AND_SANITIZER_KEY in failed_tools: failed_tools.remove(COMPILER_AND_SANITIZER_KEY)
-        elif line.startswith('Assertion rate:'):
-            assertions = get_absolute_value(split_line[-1])
-            if ASSERTIONS_KEY in failed_tools: failed_tools.remove(ASSERTIONS_KEY)
-        elif line.startswith('Total weighted Cppcheck warning rate:'):
-            cppcheck_warnings = get_absolute_value(split_line[-1])
-            if CPPCHECK_KEY in failed_tools: failed_tools.remove(CPPCHECK_KEY)
-        elif line.startswith('Weighted Clang-tidy warning rate:'):
-            clang_tidy_warnings = get_absolute_value(split_line[-1])
-            if CLANG_TIDY_KEY in failed_tools: failed_tools.remove(CLANG_TIDY_KEY)
-        elif line.startswith('Average cyclomatic complexity:'):
-            ccn = float(split_line[-1])
-            if CYCLOMATIC_COMPLEXITY_KEY in failed_tools: failed_tools.remove(CYCLOMATIC_COMPLEXITY_KEY)
-        elif line.startswith('Lizard warning rate (~= rate of functions that are too complex):'):
-            functions = int(split_line[-1].split('/')[1][:-1])
-            lizard_warnings = get_absolute_value(split_line[-1])
-            if LIZARD_WARNINGS_KEY in failed_tools: failed_tools.remove(LIZARD_WARNINGS_KEY)
-        elif line.startswith('Unique code rate:'):
-            unique = float(split_line[-1])
-            if UNIQUE_KEY in failed_tools: failed_tools.remove(UNIQUE_KEY)
-        elif line.startswith('KWStyle warning rate:'):
-            kwstyle_warnings = get_absolute_value(split_line[-1])
-            if KWSTYLE_KEY in failed_tools: failed_tools.remove(KWSTYLE_KEY)
-        elif line.startswith('Weighted Infer warning rate:'):
-            infer_warnings = get_absolute_value(split_line[-1])
-            if INFER_KEY in failed_tools: failed_tools.remove(INFER_KEY)
-        elif line.startswith('Amount of unit test LOC compared to overall LOC:'):
-            test_count_loc = get_absolute_value(split_line[-1])
-            if TESTCOUNT_KEY in failed_tools: failed_tools.remove(TESTCOUNT_KEY)
-
-    return loc, functions, compiler_warnings, sanitizer_warnings, assertions, cppcheck_warnings, clang_tidy_warnings, \
-           ccn, lizard_warnings, unique, kwstyle_warnings, infer_warnings, test_count_loc, failed_tools
+    return rates[COMPILER_AND_SANITIZER_KEY], rates[ASSERTIONS_KEY], rates[CPPCHECK_KEY], rates[CLANG_TIDY_KEY], \
+           rates[CYCLOMATIC_COMPLEXITY_KEY], rates[LIZARD_WARNINGS_KEY], rates[UNIQUE_KEY], rates[KWSTYLE_KEY], \
+           rates[INFER_KEY], rates[TESTCOUNT_KEY], get_tools_from_mask(parsed_output.rates_failed_tools)
+
+
+def get_result_values(result_directory, folder):
+    parsed_output = parse_softwipe_output(result_directory, folder)
+    values = parsed_output.values
+
+    return values[LOC_KEY], values[FUNCTIONS_KEY], values[COMPILER_KEY], values[SANITIZER_KEY], \
+           values[ASSERTIONS_KEY], values[CPPCHECK_KEY], values[CLANG_TIDY_KEY], values[CYCLOMATIC_COMPLEXITY_KEY], \
+           values[LIZARD_WARNINGS_KEY], values[UNIQUE_KEY], values[KWSTYLE_KEY], values[INFER_KEY], \
+           values[TESTCOUNT_KEY], get_tools_from_mask(parsed_output.values_failed_tools)
 
 
 def calculate_scores(result_directory, absolute):
-    # Init
+    """
+    Calculate the scores (or, if absolute, the absolute values) of all programs in FOLDERS.
+    :param result_directory: The directory containing all result folders.
+    :param absolute: Whether to get the absolute values instead of the scores.
+    :return: A dict that maps each score to a list with one entry per folder, in the order of FOLDERS (None where the
+    score is missing), and a list with the failed tools of each folder, in the same order.
+    """
+    # Init: One column per score, indexed like FOLDERS
     if absolute:
-        scores = {
-            'loc': {},
-            'functions': {},
-            'compiler': {},
-            'sanitizer': {},
-            'assertions': {},
-            'cppcheck': {},
-            'clang_tidy': {},
-            'cyclomatic_complexity': {},
-            'lizard_warnings': {},
-            'unique': {},
-            'kwstyle': {},
-            'infer': {},
-            TESTCOUNT_KEY: {}
-        }
+        score_keys = [LOC_KEY, FUNCTIONS_KEY, COMPILER_KEY, SANITIZER_KEY, ASSERTIONS_KEY, CPPCHECK_KEY, CLANG_TIDY_KEY,
+                      CYCLOMATIC_COMPLEXITY_KEY, LIZARD_WARNINGS_KEY, UNIQUE_KEY, KWSTYLE_KEY, INFER_KEY, TESTCOUNT_KEY]
     else:
-        scores = {
-            'overall': {},
-            'compiler_and_sanitizer': {},
-            'assertions': {},
-            'cppcheck': {},
-            'clang_tidy': {},
-            'cyclomatic_complexity': {},
-            'lizard_warnings': {},
-            'unique': {},
-            'kwstyle': {},
-            'infer': {},
-            TESTCOUNT_KEY: {}
-        }
-
-    failed_tools_dict = {}
-
-    for score in scores:
-        for folder in FOLDERS:
-            scores[score][folder] = None
+        score_keys = ['overall', COMPILER_AND_SANITIZER_KEY, ASSERTIONS_KEY, CPPCHECK_KEY, CLANG_TIDY_KEY,
+                      CYCLOMATIC_COMPLEXITY_KEY, LIZARD_WARNINGS_KEY, UNIQUE_KEY, KWSTYLE_KEY, INFER_KEY, TESTCOUNT_KEY]
+        tool_score_keys = score_keys[1:]  # The scores that go into the overall score, i.e. all but 'overall'
+    scores = {score: [None] * len(FOLDERS) for score in score_keys}
+
+    failed_tools_list = []
+
+    # Read and parse the softwipe outputs of all folders concurrently. parse_softwipe_output() caches its results, so
+    # get_result_values() and get_result_rates() below only look them up.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(functools.partial(parse_softwipe_output, result_directory), FOLDERS))
 
     # Get all the scores
-    for folder in FOLDERS:
+    for i, folder in enumerate(FOLDERS):
 
         if absolute:
             # Get values
@@ -247,19 +293,19 @@ def calculate_scores(result_directory, absolute):
             ccn, lizard_warnings, unique, kwstyle_warnings, infer_warnings, test_count_loc, failed_tools = get_result_values(
                 result_directory, folder)
 
-            scores['loc'][folder] = loc
-            scores['functions'][folder] = functions
-            scores['compiler'][folder] = compiler_warnings
-            scores['sanitizer'][folder] = sanitizer_warnings
-            scores['assertions'][folder] = assertions
-            scores['cppcheck'][folder] = cppcheck_warnings
-            scores['clang_tidy'][folder] = clang_tidy_warnings
-            scores['cyclomatic_complexity'][folder] = ccn
-            scores['lizard_warnings'][folder] = lizard_warnings
-            scores['unique'][folder] = unique
-            scores['kwstyle'][folder] = kwstyle_warnings
-            scores['infer'][folder] = infer_warnings
-            scores[TESTCOUNT_KEY][folder] = test_count_loc
+            scores['loc'][i] = loc
+            scores['functions'][i] = functions
+            scores['compiler'][i] = compiler_warnings
+            scores['sanitizer'][i] = sanitizer_warnings
+            scores['assertions'][i] = assertions
+            scores['cppcheck'][i] = cppcheck_warnings
+            scores['clang_tidy'][i] = clang_tidy_warnings
+            scores['cyclomatic_complexity'][i] = ccn
+            scores['lizard_warnings'][i] = lizard_warnings
+            scores['unique'][i] = unique
+            scores['kwstyle'][i] = kwstyle_warnings
+            scores['infer'][i] = infer_warnings
+            scores[TESTCOUNT_KEY][i] = test_count_loc
 
         else:
             # Get rates
@@ -269,89 +315,80 @@ def calculate_scores(result_directory, absolute):
 
             # Get scores
             if COMPILER_KEY not in failed_tools:
-                scores['compiler_and_sanitizer'][folder] = \
+                scores['compiler_and_sanitizer'][i] = \
                     scoring.calculate_compiler_and_sanitizer_score_absolute(compiler_and_sanitizer_rate)
             if ASSERTIONS_KEY not in failed_tools:
-                scores['assertions'][folder] = scoring.calculate_assertion_score_absolute(assertion_rate)
+                scores['assertions'][i] = scoring.calculate_assertion_score_absolute(assertion_rate)
             if CPPCHECK_KEY not in failed_tools:
-                scores['cppcheck'][folder] = scoring.calculate_cppcheck_score_absolute(cppcheck_rate)
+                scores['cppcheck'][i] = scoring.calculate_cppcheck_score_absolute(cppcheck_rate)
             if CLANG_TIDY_KEY not in failed_tools:
-                scores['clang_tidy'][folder] = scoring.calculate_clang_tidy_score_absolute(clang_tidy_rate)
+                scores['clang_tidy'][i] = scoring.calculate_clang_tidy_score_absolute(clang_tidy_rate)
             if CYCLOMATIC_COMPLEXITY_KEY not in failed_tools:
-                scores['cyclomatic_complexity'][folder] = scoring.calculate_cyclomatic_complexity_score_absolute(ccn)
+                scores['cyclomatic_complexity'][i] = scoring.calculate_cyclomatic_complexity_score_absolute(ccn)
             if LIZARD_WARNINGS_KEY not in failed_tools:
-                scores['lizard_warnings'][folder] = scoring.calculate_lizard_warning_score_absolute(lizard_rate)
+                scores['lizard_warnings'][i] = scoring.calculate_lizard_warning_score_absolute(lizard_rate)
             if UNIQUE_KEY not in failed_tools:
-                scores['unique'][folder] = scoring.calculate_unique_score_absolute(unique_rate)
+                scores['unique'][i] = scoring.calculate_unique_score_absolute(unique_rate)
             if KWSTYLE_KEY not in failed_tools:
-                scores['kwstyle'][folder] = scoring.calculate_kwstyle_score_absolute(kwstyle_rate)
+                scores['kwstyle'][i] = scoring.calculate_kwstyle_score_absolute(kwstyle_rate)
             if INFER_KEY not in failed_tools:
-                scores['infer'][folder] = scoring.calculate_infer_score_absolute(infer_rate)
+                scores['infer'][i] = scoring.calculate_infer_score_absolute(infer_rate)
             if TESTCOUNT_KEY not in failed_tools:
-                scores[TESTCOUNT_KEY][folder] = scoring.calculate_testcount_score_absolute(test_count_rate)
+                scores[TESTCOUNT_KEY][i] = scoring.calculate_testcount_score_absolute(test_count_rate)
 
             # Calculate the overall score
-            list_of_scores = [scores[score][folder] for score in scores.keys()
-                              if score != 'overall' and score not in failed_tools]
-            if None in list_of_scores: list_of_scores = []
+            list_of_scores = [scores[score][i] for score in tool_score_keys if score not in failed_tools]
 
-            if list_of_scores:
-                scores['overall'][folder] = scoring.average_score(list_of_scores)
+            if list_of_scores and None not in list_of_scores:
+                scores['overall'][i] = scoring.average_score(list_of_scores)
             else:
-                scores['overall'][folder] = -1
+                scores['overall'][i] = -1
 
-        failed_tools_dict[folder] = failed_tools
+        failed_tools_list.append(failed_tools)
 
-    return scores, failed_tools_dict
+    return scores, failed_tools_list
 
 
 def print_score_csv(scores, absolute, failed_tools, print_only_overall=False):
     if absolute:
-        last_column = TESTCOUNT_KEY
         space_pattern = [17, 8, 11, 10, 11, 12, 10, 12, 23, 17, 20, 9, 7, len(TESTCOUNT_KEY) + 2]
     else:
-        last_column = TESTCOUNT_KEY
         space_pattern = [22, 9, 24, 12, 10, 12, 23, 17, 8, 9, 7, len(TESTCOUNT_KEY) + 2]
 
-    print('program', end=',')
-    for score in scores:
-        if score != last_column:
-            print(score, end=',')
-        else:
-            print(score)
-    for folder in FOLDERS:
+    # Collect the whole table and write it at once instead of printing every cell separately
+    output = ['program,' + ','.join(scores) + '\n']
+    for i, folder in enumerate(FOLDERS):
         if not print_only_overall:
-            print("| {}".format(folder).ljust(space_pattern[0]), end="|")
+            output.append("| {}".format(folder).ljust(space_pattern[0]) + "|")
             counter = 1
 
             for score in scores:
-                if score in failed_tools[folder]:
+                if score in failed_tools[i]:
                     value = "N/A"
-                    print(" {}".format(value).ljust(space_pattern[counter]), end="|")
+                    output.append(" {}".format(value).ljust(space_pattern[counter]) + "|")
                 else:
-                    if scores[score][folder] is not None:
-                        value = round(scores[score][folder], 4) if absolute else round(scores[score][folder], 1)
+                    if scores[score][i] is not None:
+                        value = round(scores[score][i], 4) if absolute else round(scores[score][i], 1)
                     else:
                         value = "N/A"
 
                     if absolute:
-                        print(" {}".format(value).ljust(space_pattern[counter]), end="|")
+                        output.append(" {}".format(value).ljust(space_pattern[counter]) + "|")
                     else:
-                        print(" {0:0.1f}".format(value).ljust(space_pattern[counter]), end="|")
+                        output.append(" {0:0.1f}".format(value).ljust(space_pattern[counter]) + "|")
 
                 counter += 1
-            print("")
+            output.append("\n")
         else:
-            print(round(scores['overall'][folder], 1))
+            output.append("{}\n".format(round(scores['overall'][i], 1)))
+    sys.stdout.write(''.join(output))
 
 
 def main():
     args = parse_arguments()
     result_directory = os.path.abspath(args.result_directory[0])
-    absolute = True if args.absolute else False
-    print_only_overall = True if args.only_overall_scores else False
-    scores, failed_tools = calculate_scores(result_directory, absolute)
-    print_score_csv(scores, absolute, failed_tools=failed_tools, print_only_overall=print_only_overall)
+    scores, failed_tools = calculate_scores(result_directory, args.absolute)
+    print_score_csv(scores, args.absolute, failed_tools=failed_tools, print_only_overall=args.only_overall_scores)
 
 
 if __name__ == "__main__":
@@ -83,7 +83,7 @@ def sort_rates(rates):
     sorted_rates = {}
 
     for rate in rates.keys():
-        reverse = True if rate in ('assertions', 'unique') else False  # For these two rates, higher is better,
+        reverse = rate in ('assertions', 'unique')  # For these two rates, higher is better,
         # so sort in reverse order. For all other rates, lower is better.
         sorted_rates[rate] = sorted(rates[rate], key=operator.itemgetter(1), reverse=reverse)
 
@@ -116,16 +116,14 @@ def print_compilation_results(warning_lines, lines_of_code, append_to_file):
     weighted_sum_of_warnings = 0
     number_of_warnings_in_level = [0] * 3
 
+    compiler_warnings = classifications.COMPILER_WARNINGS
     cur_warning_level = 0
     for line in warning_lines:
         if line_is_warning_line(line):
             # Get the classified warning level
-            split_line = line.split()
-            warning_name = split_line[-1][1:-1]
+            warning_name = line.rsplit(None, 1)[-1][1:-1]  # The last word is "[-Wname]"; only split that one off
 
-            cur_warning_level = 1  # Default to 1
-            if warning_name in classifications.COMPILER_WARNINGS:
-                cur_warning_level = classifications.COMPILER_WARNINGS[warning_name]
+            cur_warning_level = compiler_warnings.get(warning_name, 1)  # Default to 1
 
             weighted_sum_of_warnings += cur_warning_level
             number_of_warnings_in_level[cur_warning_level - 1] += 1
@@ -163,10 +161,11 @@ def remove_excluded_paths_from_warning_lines(warning_lines, excluded_paths):
     new_warning_lines = []
     do_add_lines = True
     lines_to_remove = set()  # will contain indices of lines that should be removed later
+    excluded_paths_regex = util.get_excluded_paths_regex(tuple(excluded_paths))
     for i, line in enumerate(warning_lines):
         if line_is_warning_line(line):
             # if this is a warning for an excluded path
-            if any(excluded_path in line for excluded_path in excluded_paths):
+            if excluded_paths_regex is not None and excluded_paths_regex.search(line):
                 do_add_lines = False
                 # If lines before this one were "In file included from..." lines, remove those retrospectively
                 # (that is, add them to lines_to_remove)
@@ -246,7 +245,7 @@ def run_make(build_path, lines_of_code, excluded_paths, dont_check_for_warnings=
 
 def parse_make_command_file_and_run_all_commands_in_it(make_command_file, program_dir_abs, working_directory,
                                                        lines_of_code, compiler_flags, excluded_paths):
-    commands = open(make_command_file, 'r').readlines()
+    commands = util.read_text(make_command_file).splitlines()
     have_already_written_into_file = False
     weighted_sum_of_warnings = 0
     for command in commands:
@@ -256,9 +255,8 @@ def parse_make_command_file_and_run_all_commands_in_it(make_command_file, progra
 
             make_flags += ' ' + strings.create_make_flags(compiler_flags=compiler_flags)
 
-            append_to_file = True if have_already_written_into_file else False
             r = run_make(working_directory, lines_of_code, excluded_paths, make_flags=make_flags,
-                         append_to_file=append_to_file, run_compiledb=True)
+                         append_to_file=have_already_written_into_file, run_compiledb=True)
             if r:
                 weighted_sum_of_warnings += r
             have_already_written_into_file = True
@@ -377,6 +375,45 @@ def compile_program_clang(program_dir_abs, targets, lines_of_code, compiler_flag
     return weighted_sum_of_warnings
 
 
+def _compile_program_make(args, program_dir_abs, lines_of_code, cpp, compiler_flags, excluded_paths):
+    return compile_program_make(program_dir_abs, lines_of_code, compiler_flags, excluded_paths,
+                                make_command_file=args.command_file)
+
+
+def _compile_program_clang(args, program_dir_abs, lines_of_code, cpp, compiler_flags, excluded_paths):
+    return compile_program_clang(program_dir_abs, args.clang, lines_of_code, compiler_flags, excluded_paths, cpp)
+
+
+def _compile_program_cmake(args, program_dir_abs, lines_of_code, cpp, compiler_flags, excluded_paths):
+    additional_args = util.read_text(args.cmake_options_file).split() if args.cmake_options_file else []
+    return compile_program_cmake(program_dir_abs, lines_of_code, compiler_flags, excluded_paths,
+                                 make_command_file=args.command_file, additional_args=additional_args)
+
+
+# Compilation function for each build mode, see softwipe.get_build_mode()
+_COMPILE_FUNCTIONS = {
+    'make': _compile_program_make,
+    'clang': _compile_program_clang,
+    'cmake': _compile_program_cmake,
+}
+
+
+def compile_program(args, program_dir_abs, lines_of_code, cpp, compiler_flags, excluded_paths):
+    """
+    Compile the program with the build mode selected via the command line (make, clang, or cmake).
+    :param args: The "args" Namespace as returned from parse_arguments(), with args.build_mode set.
+    :param program_dir_abs: The absolute path to the root directory of the target program.
+    :param lines_of_code: The lines of pure code count.
+    :param cpp: Whether C++ is used or not. True if C++, False if C.
+    :param compiler_flags: The flags to be used for compilation. Typically, these should be strings.COMPILE_FLAGS or,
+    if no_execution, strings.COMPILER_WARNING_FLAGS.
+    :param excluded_paths: A tuple containing the paths to be excluded.
+    :return The weighted sum of compiler warnings.
+    """
+    compile_function = _COMPILE_FUNCTIONS[args.build_mode]
+    return compile_function(args, program_dir_abs, lines_of_code, cpp, compiler_flags, excluded_paths)
+
+
 def get_infer_exclude_arguments(program_dir_abs, excluded_paths):
     """
     Prepares the arguments to add to the 'infer capture' call to exclude certain files from the analysis.
@@ -24,9 +24,7 @@ def build_command(program_dir_abs, executefile, cmake):
     """
     # Read file and create command as a lst
     if executefile is not None and os.path.isfile(executefile):
-        file = open(executefile, 'r')
-        lines = file.readlines()
-        file.close()
+        lines = util.read_text(executefile).splitlines()
 
         command_line = lines[0]
         command = command_line.split()
@@ -84,7 +82,7 @@ def run_execution(program_dir_abs, executefile, cmake, lines_of_code):
     :param lines_of_code: The lines of pure code count.
     :return The weighted sum of sanitizer errors.
     """
-    print(strings.RUN_EXECUTION_WITH_SANITIZERS_HEADER)
+    print(strings.RUN_EXECUTION_WITH_SANITIZERS_HEADER, flush=True)
 
     command, command2 = build_command(program_dir_abs, executefile, cmake)
     os.environ['ASAN_OPTIONS'] = 'halt_on_error=0'
@@ -3,11 +3,32 @@ This module contains output classes, that is classes that are used to describe t
 a way that is easy to handle.
 """
 
+import collections
+
 import classifications
 import scoring
 import strings
 
 
+# The markers by which the type of a cppcheck warning line is recognized, in the order in which they are checked, and
+# the type each of them stands for. Notes count as information.
+CPPCHECK_WARNING_TYPE_MARKERS = (('error:', 'error'), ('warning:', 'warning'), ('style:', 'style'),
+                                 ('portability:', 'portability'), ('information:', 'information'),
+                                 ('note:', 'information'), ('performance:', 'performance'))
+
+
+def get_cppcheck_warning_type(line):
+    """
+    Get the type of a cppcheck warning line.
+    :param line: The warning line.
+    :return: The warning type, e.g. 'style', or "" if the line has none of the known types.
+    """
+    for marker, warning_type in CPPCHECK_WARNING_TYPE_MARKERS:
+        if marker in line:
+            return warning_type
+    return ""
+
+
 class CppcheckOutput:
     """
     Contains a count for each type of warning that cppcheck has.
@@ -17,61 +38,18 @@ class CppcheckOutput:
     """
 
     def __init__(self, warning_lines):
-        self.error_count = 0
-        self.warning_count = 0
-        self.style_count = 0
-        self.portability_count = 0
-        self.information_count = 0
-        self.performance_count = 0
-        self.total_weighted_count = 0
-
-        for line in warning_lines:
-            """split_line = line.split()
-            warning_type = [substring for substring in split_line if substring.startswith('(') and substring.endswith(
-                ')')][0]
-
-            # Add to the count of this warning type
-            if warning_type == '(error)':
-                self.error_count += 1
-            elif warning_type == '(warning)':
-                self.warning_count += 1
-            elif warning_type == '(style)':
-                self.style_count += 1
-            elif warning_type == '(portability)':
-                self.portability_count += 1
-            elif warning_type == '(information)':
-                self.information_count += 1
-            elif warning_type == '(performance)':
-                self.performance_count += 1"""
-            warning_type_without_parentheses = ""
-            if "error:" in line:
-                self.error_count += 1
-                warning_type_without_parentheses = "error"
-            elif "warning:" in line:
-                self.warning_count += 1
-                warning_type_without_parentheses = "warning"
-            elif "style:" in line:
-                self.style_count += 1
-                warning_type_without_parentheses = "style"
-            elif "portability:" in line:
-                self.portability_count += 1
-                warning_type_without_parentheses = "portability"
-            elif "information:" in line:
-                self.information_count += 1
-                warning_type_without_parentheses = "information"
-            elif "note:" in line:
-                self.information_count += 1
-                warning_type_without_parentheses = "information"
-            elif "performance:" in line:
-                self.performance_count += 1
-                warning_type_without_parentheses = "performance"
-
-                # Add to the total weighted count
-            # warning_type_without_parentheses = warning_type[1:-1]
-            warning_level = 1
-            if warning_type_without_parentheses in classifications.CPPCHECK_WARNINGS:
-                warning_level = classifications.CPPCHECK_WARNINGS[warning_type_without_parentheses]
-            self.total_weighted_count += warning_level
+        warning_types = collections.Counter(get_cppcheck_warning_type(line) for line in warning_lines)
+
+        self.error_count = warning_types['error']
+        self.warning_count = warning_types['warning']
+        self.style_count = warning_types['style']
+        self.portability_count = warning_types['portability']
+        self.information_count = warning_types['information']
+        self.performance_count = warning_types['performance']
+        # Lines of an unknown type count with the default warning level 1
+        cppcheck_warnings = classifications.CPPCHECK_WARNINGS
+        self.total_weighted_count = sum(cppcheck_warnings.get(warning_type, 1) * count
+                                        for warning_type, count in warning_types.items())
 
     def print_information(self, lines_of_code):
         total_cppcheck_rate, log = self.get_information(lines_of_code)
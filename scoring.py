@@ -1,8 +1,32 @@
 """
 Functions for calculating the scores for each category that is checked by softwipe.
 """
+import functools
+import math
+import sys
+from enum import IntEnum
+
 import numpy as np
-from scipy.optimize import curve_fit
+from scipy.optimize import leastsq
+
+# Constants of the sigmoid parts of _calculate_score_smooth_linear(). The slope k and the midpoint x0 of both sigmoids
+# only depend on the width d = best - worst of the [worst, best] interval: k = _K_* / d and x0 = _X0_* * d.
+_L01 = math.log(1 / 0.01 - 1)
+_L05 = math.log(1 / 0.05 - 1)
+_L95 = math.log(1 / 0.95 - 1)
+_L99 = math.log(1 / 0.99 - 1)
+_K_LOW = _L01 - _L05
+_X0_LOW = _L05 / _K_LOW
+_K_HIGH = _L95 - _L99
+_X0_HIGH_OFFSET = _L95 / _K_HIGH + 1
+# Slope (relative to d) and offset of the linear middle part of _calculate_score_smooth_linear(), indexed by case.
+_SMOOTH_LINEAR_MID_PARAMETERS = ((0.9, 0.05), (0.95, 0.05), (0.95, 0))
+# Grid of the lookup tables that _calculate_score_absolute() interpolates in: The number of intervals between worst and
+# best, and the number of intervals beyond each of them. This way, worst, best, and the midpoint between them (where
+# the scoring functions have their kinks) are grid points.
+_ABSOLUTE_SCORE_TABLE_INTERVALS = 640
+_ABSOLUTE_SCORE_TABLE_MARGIN = 128
+_ABSOLUTE_SCORE_TABLE_SIZE = _ABSOLUTE_SCORE_TABLE_INTERVALS + 2 * _ABSOLUTE_SCORE_TABLE_MARGIN + 1
 
 
 def print_score(score, score_name=None):
@@ -11,8 +35,8 @@ def print_score(score, score_name=None):
     :param score: The score to print.
     :param score_name: Give the score a name which will be printed as well.
     """
-    print(get_score_string(score, score_name))
-    print()
+    # Written in one go instead of two print() calls, so that the score line and the empty line after it are one write
+    sys.stdout.write(get_score_string(score, score_name) + '\n\n')
 
 
 def get_score_string(score, score_name=""):
@@ -25,11 +49,11 @@ def average_score(list_of_scores):
     :param list_of_scores: A lst containing all scores to average over.
     :return: The average score.
     """
-    avg = sum(list_of_scores) / float(len(list_of_scores))
+    avg = math.fsum(list_of_scores) / len(list_of_scores)
     return avg
 
 
-def _calculate_score_generic(rate, best, worst):
+def _calculate_score_generic(rate, best, worst, inv_d=None):
     """
     Calculates a score from 0 to 10 from a rate, given the best and worst rates. This is a generic function that
     should be called by all other functions. If best > worst, it is assumed that higher is better, else it is assumed
@@ -37,29 +61,77 @@ def _calculate_score_generic(rate, best, worst):
     :param rate: The rate for which a score should be calculated.
     :param best: The rate for which a 10/10 score should be yielded.
     :param worst: The rate for which a 0/10 score should be yielded.
+    :param inv_d: Optional, precomputed 1 / (best - worst). Calculated if not given.
     :return: A score between 0 and 10.
     """
+    if inv_d is None:
+        inv_d = 1.0 / (best - worst)
+    if not np.isscalar(rate):
+        return _calculate_score_generic_vec(rate, best, worst, inv_d=inv_d)
+
     # The following can be seen as a linear function f where f(worst) = 0 and f(best) = 10. Simple math yields this
     # exact formula. The slope of this function (10/(best-worst)) is positive if best > worst and negative if worst >
     # best. Thus, this function works as intended in both cases.
-    score = (10 * rate) / (best - worst) - (10 * worst) / (best - worst)
+    score = 10.0 * (rate - worst) * inv_d
     # The linear function produces scores < 0 and > 10 if rate is worse than worst or better than best, respectively.
-    # Thus, the score value needs to be corrected.
-    if score > 10:
-        score = 10
-    elif score < 0:
-        score = 0
+    # Thus, the score value needs to be clamped.
+    return max(0.0, min(10.0, score))
 
-    return score
+
+def _calculate_score_generic_vec(rates, best, worst, inv_d=None):
+    """
+    Vectorized version of _calculate_score_generic(). Calculates the scores for a whole array of rates at once, which is
+    a lot faster than calling the scalar function in a loop when scoring many projects.
+    :param rates: An array (or any sequence) of rates for which the scores should be calculated.
+    :param best: The rate for which a 10/10 score should be yielded.
+    :param worst: The rate for which a 0/10 score should be yielded.
+    :param inv_d: Optional, precomputed 1 / (best - worst). Calculated if not given.
+    :return: An array of scores between 0 and 10.
+    """
+    if inv_d is None:
+        inv_d = 1.0 / (np.asarray(best) - worst)
+    rates = np.asarray(rates, dtype=np.float64)
+    return np.clip(10.0 * (rates - worst) * inv_d, 0, 10)
 
 
 def _calculate_score_absolute(rate, best, worst, case=0):
     """
-    Function was used to compare different scoring methods.
+    Function was used to compare different scoring methods. Rates within the range covered by the lookup table of
+    _get_absolute_score_table() are scored by linear interpolation, all others are calculated exactly.
     """
+    t = (rate - worst) / (best - worst)
+    # The constant parts are returned exactly, e.g. 10 for 0 warnings, without going through the interpolation
+    if case == 1 and t >= 1:
+        return 10
+    if case == 2 and t <= 0:
+        return 0
+
+    ys = _get_absolute_score_table(best, worst, case)
+    pos = t * _ABSOLUTE_SCORE_TABLE_INTERVALS + _ABSOLUTE_SCORE_TABLE_MARGIN
+    if 0 <= pos < _ABSOLUTE_SCORE_TABLE_SIZE - 1:
+        i = int(pos)
+        return ys[i] + (ys[i + 1] - ys[i]) * (pos - i)
     return _calculate_score_curve_fit_combined(rate, best, worst, case=case)
 
 
+@functools.lru_cache(maxsize=None)
+def _get_absolute_score_table(best, worst, case):
+    """
+    Tabulates the absolute scoring function for one (best, worst, case) combination on an evenly spaced grid over
+    [worst - 0.2d, best + 0.2d], on which worst and best are grid points. The table is built on first use, so only the
+    tools that actually get scored pay for it.
+    :param best: upper rate boundary
+    :param worst: lower rate boundary
+    :param case: see _calculate_score_curve_fit_combined()
+    :return: The list of scores on the grid. Grid point i is at t = (i - margin) / intervals of the [worst, best]
+             interval, with margin and intervals as in _ABSOLUTE_SCORE_TABLE_MARGIN / _ABSOLUTE_SCORE_TABLE_INTERVALS.
+    """
+    d = best - worst
+    ts = np.arange(-_ABSOLUTE_SCORE_TABLE_MARGIN, _ABSOLUTE_SCORE_TABLE_INTERVALS + _ABSOLUTE_SCORE_TABLE_MARGIN + 1)
+    ts = ts / _ABSOLUTE_SCORE_TABLE_INTERVALS  # Exact at the integer multiples of 0.5, i.e. at worst, mid, and best
+    return [float(_calculate_score_curve_fit_combined(worst + float(t) * d, best, worst, case=case)) for t in ts]
+
+
 def _calculate_score_smooth_linear(rate, best, worst, case=0):
     """
     Calculates an absolute score with regard to some best and worst rates but stays within the 0-10 score range if
@@ -81,43 +153,84 @@ def _calculate_score_smooth_linear(rate, best, worst, case=0):
         case 1: sigmoid  - linear - constant
         case 2: constant - linear - sigmoid
     """
+    if not np.isscalar(rate):
+        return _calculate_score_smooth_linear_vec(rate, best, worst, case=case)
 
     d = best - worst
-    x = (rate - worst)
-    score = 0
+    x = rate - worst
+    t = x / d
 
-    if x / d <= 0:  # approach the 0 with a sigmoid
-        if case != 2:
-            k = (np.log(1 / 0.01 - 1) - np.log(1 / 0.05 - 1)) / d
-            x0 = np.log(1 / 0.05 - 1) / k
-            score = 10 * sigmoid(x, x0, k)
-        else:
-            score = 0
-    elif x / d >= 1:  # approach the 10 with a sigmoid
-        if case != 1:
-            k = (np.log(1 / 0.95 - 1) - np.log(1 / 0.99 - 1)) / d
-            x0 = np.log(1 / 0.95 - 1) / k + d
-            score = 10 * sigmoid(x, x0, k)
-        else:
-            score = 10
-    else:  # use a linear function for the middle part of the evaluation function
-        if case == 0:
-            a = 0.9 / d
-            b = 0.05
-        elif case == 1:
-            a = 0.95 / d
-            b = 0.05
-        else:
-            a = 0.95 / d
-            b = 0
-        score = 10 * (a * x + b)
-    return score
+    if t <= 0:  # approach the 0 with a sigmoid
+        if case == 2:
+            return 0
+        return 10 * _sigmoid_fast(x, _X0_LOW * d, _K_LOW / d)
+    elif t >= 1:  # approach the 10 with a sigmoid
+        if case == 1:
+            return 10
+        return 10 * _sigmoid_fast(x, _X0_HIGH_OFFSET * d, _K_HIGH / d)
 
+    # use a linear function for the middle part of the evaluation function
+    a, b = _SMOOTH_LINEAR_MID_PARAMETERS[case]
+    return 10 * (a * t + b)
 
+
+def _calculate_score_smooth_linear_vec(rates, best, worst, case=0):
+    """
+    Vectorized version of _calculate_score_smooth_linear(). All three parts of the evaluation function are evaluated on
+    the whole array and the right one is picked for each rate using masks.
+    :param rates: An array (or any sequence) of rates for which the scores should be calculated.
+    :param best: The rate for which a v/10 should be yielded
+    :param worst: The rate for which a (10-v)/10 score should be yielded.
+    :param case: The case covers different possibilities to assemble the evaluation function, see
+        _calculate_score_smooth_linear().
+    :return: An array of scores between 0 and 10.
+    """
+    d = best - worst
+    x = np.asarray(rates, dtype=np.float64) - worst
+    t = x / d
+
+    low = 10 * sigmoid(x, _X0_LOW * d, _K_LOW / d) if case != 2 else np.zeros_like(x)
+    high = 10 * sigmoid(x, _X0_HIGH_OFFSET * d, _K_HIGH / d) if case != 1 else np.full_like(x, 10)
+    a, b = _SMOOTH_LINEAR_MID_PARAMETERS[case]
+    mid = 10 * (a * t + b)
+
+    return np.where(t <= 0, low, np.where(t >= 1, high, mid))
+
+
+@functools.lru_cache(maxsize=None)
+def _fit_sigmoid_parameters(d):
+    """
+    Fits the sigmoid used by _calculate_score_curve_fit() to the [0, d] interval. The fit only depends on the interval
+    width, so it is cached and done once per distinct d. The analytic Jacobian of the sigmoid is passed to the least
+    squares solver, which saves the finite difference evaluations.
+    :param d: width best - worst of the rates interval
+    :return: tuple (x0, k) of the fitted sigmoid parameters
+    """
+    thresh = 0.90
+    xval = np.array([(1 - thresh) * d, 0.25 * d, 0.5 * d, 0.75 * d, thresh * d])
+    yval = np.array([(1 - thresh), 0.25, 0.5, 0.75, thresh])
+
+    def residuals(p):
+        return sigmoid(xval, *p) - yval
+
+    def jacobian(p):
+        x0, k = p
+        y = sigmoid(xval, x0, k)
+        dy = y * (1 - y)
+        return np.column_stack((-k * dy, (xval - x0) * dy))
+
+    popt, ier = leastsq(residuals, [0.5 * d, 4 / d], Dfun=jacobian)
+    if ier not in (1, 2, 3, 4):  # Like curve_fit, fail instead of scoring with (and caching) a failed fit
+        raise RuntimeError('Optimal parameters not found: the sigmoid fit failed with ier = {}'.format(ier))
+
+    return tuple(popt)
+
+
+@functools.lru_cache(maxsize=4096)
 def _calculate_score_curve_fit(rate, best, worst):
     """
-    Makes use of scipy's curve_fit() and scales a sigmoid function to calculate an absolute score
-    based on the [worst, best] rates interval.
+    Fits and scales a sigmoid function to calculate an absolute score
+    based on the [worst, best] rates interval. Results are cached, as the same rates get scored repeatedly.
     :param rate: rate to calculate the score for
     :param best: upper rate boundary
     :param worst: lower rate boundary
@@ -125,12 +238,8 @@ def _calculate_score_curve_fit(rate, best, worst):
     """
     d = best - worst
     x = rate - worst
-    thresh = 0.90
-    xval = [(1 - thresh) * d, 0.25 * d, 0.5 * d, 0.75 * d, thresh * d]
-    yval = [(1 - thresh), 0.25, 0.5, 0.75, thresh]
-    popt, pcov = curve_fit(sigmoid, xval, yval)
 
-    return 10 * sigmoid(x, *popt)
+    return 10 * _sigmoid_fast(x, *_fit_sigmoid_parameters(d))
 
 
 def _calculate_score_curve_fit_combined(rate, best, worst, case=0):
@@ -176,6 +285,14 @@ def sigmoid(x, x0, k):
     return y
 
 
+def _sigmoid_fast(x, x0, k):
+    """
+    Calculates a single value of the sigmoid function. Uses the identity 1 / (1 + e^-t) = 0.5 * tanh(t / 2) + 0.5,
+    which is cheaper for scalars and does not overflow for large |t|.
+    """
+    return 0.5 * math.tanh(0.5 * k * (x - x0)) + 0.5
+
+
 # CONSTANTS TO BE USED BY THE CALCULATION FUNCTIONS
 
 '''
@@ -277,6 +394,42 @@ TESTCOUNT_BEST_FIXED = 0.067
 TESTCOUNT_WORST_FIXED = 0
 
 
+class Tool(IntEnum):
+    """
+    Index of the tools (i.e., the scoring categories) into the rows of SCORE_BOUNDS.
+    """
+    COMPILER = 0
+    ASSERTIONS = 1
+    CPPCHECK = 2
+    CLANG_TIDY = 3
+    CYCLOMATIC_COMPLEXITY = 4
+    LIZARD_WARNINGS = 5
+    UNIQUE = 6
+    KWSTYLE = 7
+    INFER = 8
+    VALGRIND = 9
+    TESTCOUNT = 10
+
+
+# All of the above boundaries in one array, one row per Tool with the columns [best, worst, best_fixed, worst_fixed].
+SCORE_BOUNDS = np.array([
+    [COMPILER_BEST, COMPILER_WORST, COMPILER_BEST_FIXED, COMPILER_WORST_FIXED],
+    [ASSERTIONS_BEST, ASSERTIONS_WORST, ASSERTIONS_BEST_FIXED, ASSERTIONS_WORST_FIXED],
+    [CPPCHECK_BEST, CPPCHECK_WORST, CPPCHECK_BEST_FIXED, CPPCHECK_WORST_FIXED],
+    [CLANG_TIDY_BEST, CLANG_TIDY_WORST, CLANG_TIDY_BEST_FIXED, CLANG_TIDY_WORST_FIXED],
+    [CYCLOMATIC_COMPLEXITY_BEST, CYCLOMATIC_COMPLEXITY_WORST,
+     CYCLOMATIC_COMPLEXITY_BEST_FIXED, CYCLOMATIC_COMPLEXITY_WORST_FIXED],
+    [LIZARD_WARNINGS_BEST, LIZARD_WARNINGS_WORST, LIZARD_WARNINGS_BEST_FIXED, LIZARD_WARNINGS_WORST_FIXED],
+    [UNIQUE_BEST, UNIQUE_WORST, UNIQUE_BEST_FIXED, UNIQUE_WORST_FIXED],
+    [KWSTYLE_BEST, KWSTYLE_WORST, KWSTYLE_BEST_FIXED, KWSTYLE_WORST_FIXED],
+    [INFER_BEST, INFER_WORST, INFER_BEST_FIXED, INFER_WORST_FIXED],
+    [VALGRIND_BEST, VALGRIND_WORST, VALGRIND_BEST_FIXED, VALGRIND_WORST_FIXED],
+    [TESTCOUNT_BEST, TESTCOUNT_WORST, TESTCOUNT_BEST_FIXED, TESTCOUNT_WORST_FIXED],
+], dtype=np.float64)
+# Inverse widths 1 / (best - worst) of the (non-fixed) boundaries, so that the relative scores need no division.
+_INV_D = 1.0 / (SCORE_BOUNDS[:, 0] - SCORE_BOUNDS[:, 1])
+
+
 """
 # unweighted warnings
 COMPILER_BEST = 0.0
@@ -336,89 +489,99 @@ INFER_WORST_FIXED = 0.0069125318766100115"""
 
 # FUNCTIONS THAT CALCULATE THE SCORES
 
+def calculate_all_scores(rates):
+    """
+    Calculates the (relative) scores of all tools at once.
+    :param rates: An array of rates with one rate per Tool, in the order of the Tool enum.
+    :return: An array containing the score for each Tool.
+    """
+    return _calculate_score_generic_vec(rates, SCORE_BOUNDS[:, 0], SCORE_BOUNDS[:, 1], inv_d=_INV_D)
+
+
 def calculate_compiler_and_sanitizer_score(rate):
-    return _calculate_score_generic(rate, COMPILER_BEST, COMPILER_WORST)
+    return _calculate_score_generic(rate, *SCORE_BOUNDS[Tool.COMPILER, :2], inv_d=_INV_D[Tool.COMPILER])
 
 
 def calculate_assertion_score(rate):
-    return _calculate_score_generic(rate, ASSERTIONS_BEST, ASSERTIONS_WORST)
+    return _calculate_score_generic(rate, *SCORE_BOUNDS[Tool.ASSERTIONS, :2], inv_d=_INV_D[Tool.ASSERTIONS])
 
 
 def calculate_cppcheck_score(rate):
-    return _calculate_score_generic(rate, CPPCHECK_BEST, CPPCHECK_WORST)
+    return _calculate_score_generic(rate, *SCORE_BOUNDS[Tool.CPPCHECK, :2], inv_d=_INV_D[Tool.CPPCHECK])
 
 
 def calculate_clang_tidy_score(rate):
-    return _calculate_score_generic(rate, CLANG_TIDY_BEST, CLANG_TIDY_WORST)
+    return _calculate_score_generic(rate, *SCORE_BOUNDS[Tool.CLANG_TIDY, :2], inv_d=_INV_D[Tool.CLANG_TIDY])
 
 
 def calculate_cyclomatic_complexity_score(ccn):
-    return _calculate_score_generic(ccn, CYCLOMATIC_COMPLEXITY_BEST, CYCLOMATIC_COMPLEXITY_WORST)
+    return _calculate_score_generic(ccn, *SCORE_BOUNDS[Tool.CYCLOMATIC_COMPLEXITY, :2],
+                                    inv_d=_INV_D[Tool.CYCLOMATIC_COMPLEXITY])
 
 
 def calculate_lizard_warning_score(rate):
-    return _calculate_score_generic(rate, LIZARD_WARNINGS_BEST, LIZARD_WARNINGS_WORST)
+    return _calculate_score_generic(rate, *SCORE_BOUNDS[Tool.LIZARD_WARNINGS, :2], inv_d=_INV_D[Tool.LIZARD_WARNINGS])
 
 
 def calculate_unique_score(rate):
-    return _calculate_score_generic(rate, UNIQUE_BEST, UNIQUE_WORST)
+    return _calculate_score_generic(rate, *SCORE_BOUNDS[Tool.UNIQUE, :2], inv_d=_INV_D[Tool.UNIQUE])
 
 
 def calculate_kwstyle_score(rate):
-    return _calculate_score_generic(rate, KWSTYLE_BEST, KWSTYLE_WORST)
+    return _calculate_score_generic(rate, *SCORE_BOUNDS[Tool.KWSTYLE, :2], inv_d=_INV_D[Tool.KWSTYLE])
 
 
 def calculate_infer_score(rate):
-    return _calculate_score_generic(rate, INFER_BEST, INFER_WORST)
+    return _calculate_score_generic(rate, *SCORE_BOUNDS[Tool.INFER, :2], inv_d=_INV_D[Tool.INFER])
 
 
 def calculate_valgrind_score(rate):
-    return _calculate_score_generic(rate, VALGRIND_BEST, VALGRIND_WORST)
+    return _calculate_score_generic(rate, *SCORE_BOUNDS[Tool.VALGRIND, :2], inv_d=_INV_D[Tool.VALGRIND])
 
 
 def calculate_testcount_score(rate):
-    return _calculate_score_generic(rate, TESTCOUNT_BEST, TESTCOUNT_WORST)
+    return _calculate_score_generic(rate, *SCORE_BOUNDS[Tool.TESTCOUNT, :2], inv_d=_INV_D[Tool.TESTCOUNT])
 
 
 def calculate_compiler_and_sanitizer_score_absolute(rate):
-    return _calculate_score_absolute(rate, COMPILER_BEST_FIXED, COMPILER_WORST_FIXED, case=1)
+    return _calculate_score_absolute(rate, *SCORE_BOUNDS[Tool.COMPILER, 2:], case=1)
 
 
 def calculate_assertion_score_absolute(rate):
-    return _calculate_score_absolute(rate, ASSERTIONS_BEST_FIXED, ASSERTIONS_WORST_FIXED, case=2)
+    return _calculate_score_absolute(rate, *SCORE_BOUNDS[Tool.ASSERTIONS, 2:], case=2)
 
 
 def calculate_cppcheck_score_absolute(rate):
-    return _calculate_score_absolute(rate, CPPCHECK_BEST_FIXED, CPPCHECK_WORST_FIXED, case=1)
+    return _calculate_score_absolute(rate, *SCORE_BOUNDS[Tool.CPPCHECK, 2:], case=1)
 
 
 def calculate_clang_tidy_score_absolute(rate):
-    return _calculate_score_absolute(rate, CLANG_TIDY_BEST_FIXED, CLANG_TIDY_WORST_FIXED, case=1)
+    return _calculate_score_absolute(rate, *SCORE_BOUNDS[Tool.CLANG_TIDY, 2:], case=1)
 
 
 def calculate_cyclomatic_complexity_score_absolute(ccn):
-    return _calculate_score_absolute(ccn, CYCLOMATIC_COMPLEXITY_BEST_FIXED, CYCLOMATIC_COMPLEXITY_WORST_FIXED)
+    return _calculate_score_absolute(ccn, *SCORE_BOUNDS[Tool.CYCLOMATIC_COMPLEXITY, 2:])
 
 
 def calculate_lizard_warning_score_absolute(rate):
-    return _calculate_score_absolute(rate, LIZARD_WARNINGS_BEST_FIXED, LIZARD_WARNINGS_WORST_FIXED, case=1)
+    return _calculate_score_absolute(rate, *SCORE_BOUNDS[Tool.LIZARD_WARNINGS, 2:], case=1)
 
 
 def calculate_unique_score_absolute(rate):
-    return _calculate_score_absolute(rate, UNIQUE_BEST_FIXED, UNIQUE_WORST_FIXED)
+    return _calculate_score_absolute(rate, *SCORE_BOUNDS[Tool.UNIQUE, 2:])
 
 
 def calculate_kwstyle_score_absolute(rate):
-    return _calculate_score_absolute(rate, KWSTYLE_BEST_FIXED, KWSTYLE_WORST_FIXED, case=1)
+    return _calculate_score_absolute(rate, *SCORE_BOUNDS[Tool.KWSTYLE, 2:], case=1)
 
 
 def calculate_infer_score_absolute(rate):
-    return _calculate_score_absolute(rate, INFER_BEST_FIXED, INFER_WORST_FIXED, case=1)
+    return _calculate_score_absolute(rate, *SCORE_BOUNDS[Tool.INFER, 2:], case=1)
 
 
 def calculate_valgrind_score_absolute(rate):
-    return _calculate_score_absolute(rate, VALGRIND_BEST_FIXED, VALGRIND_WORST_FIXED, case=1)
+    return _calculate_score_absolute(rate, *SCORE_BOUNDS[Tool.VALGRIND, 2:], case=1)
 
 
 def calculate_testcount_score_absolute(rate):
-    return _calculate_score_absolute(rate, TESTCOUNT_BEST_FIXED, TESTCOUNT_WORST_FIXED, case=2)
+    return _calculate_score_absolute(rate, *SCORE_BOUNDS[Tool.TESTCOUNT, 2:], case=2)
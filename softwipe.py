@@ -3,48 +3,67 @@
 The main module of softwipe. Here, command line arguments get parsed and the pipeline gets started.
 """
 
-import argparse
+import contextlib
+import functools
 import os
 import re
+import shlex
+import signal
 import sys
-import time
+import threading
 import itertools
-from multiprocessing.pool import ThreadPool
 
-import automatic_tool_installation
-import compile_phase
-import execution_phase
-import scoring
 import strings
-import util
-from analysis_tools import CppcheckTool, ClangTool, ClangTidyTool, KWStyleTool, LizardTool, AssertionTool, InferTool, \
-                           ValgrindTool, TestCountTool
+# All other softwipe modules (and argparse and concurrent.futures) are imported where they are needed, so that e.g.
+# printing one of the file helps only has to load strings. Especially scoring (which pulls in numpy and scipy),
+# analysis_tools, and automatic_tool_installation are expensive to import.
 
+_HELP_OPTIONS = ('--commandfilehelp', '--executefilehelp', '--compileroptionsfilehelp')
+_YES = frozenset(('Y', 'Yes', 'y', 'yes'))
+_NO = frozenset(('n', 'no', 'N', 'No'))
+# The effective user does not change while softwipe is running. Platforms without geteuid() have no root user either.
+_USER_IS_ROOT = hasattr(os, 'geteuid') and os.geteuid() == 0
+_ROOT_PROMPT_TIMEOUT = 30  # seconds
 
+_BADGE_SENTINEL = '[![Softwipe Score]'
+_SOFTWIPE_BADGE_RE = re.compile(r'\[!\[Softwipe Score\]\([^)\]]+\)\]\([^)\]]+\)')
+
+
+def get_help_options(argv):
+    """
+    Get the command, execute, and compiler options file help options contained in the arguments. Like the main parser,
+    this does not accept abbreviations of the options.
+    :param argv: The command line arguments, without the program name.
+    :return: A set containing the help options that were given.
+    """
+    return set(_HELP_OPTIONS).intersection(argv)
+
+
+@functools.lru_cache(maxsize=None)
 def parse_arguments():
     """
-    Parse command line arguments.
+    Parse command line arguments. The arguments are only parsed on the first call, later calls return the same
+    Namespace.
     :return: The "args" Namespace that contains the command line arguments specified by the user.
     """
-    # Preparser, used for the command, execute, and compiler options file helps. Without the preparser, one would get
-    # an error because 'programdir' is a required argument but is missing. With the preparser, the help can be
-    # printed anyway.
-    preparser = argparse.ArgumentParser(add_help=False)
-    preparser.add_argument('--commandfilehelp', default=False, action='store_true')
-    preparser.add_argument('--executefilehelp', default=False, action='store_true')
-    preparser.add_argument('--compileroptionsfilehelp', default=False, action='store_true')
-    preargs, _ = preparser.parse_known_args()
-
-    # All helps can be printed at once
-    if preargs.executefilehelp:
-        print(strings.EXECUTE_FILE_HELP)
-    if preargs.commandfilehelp:
-        print(strings.COMMAND_FILE_HELP)
-    if preargs.compileroptionsfilehelp:
-        print(strings.COMPILER_OPTIONS_FILE_HELP)
-    if preargs.executefilehelp or preargs.commandfilehelp or preargs.compileroptionsfilehelp:
-        # Exit if either one, any of the, or all helps have been printed
-        sys.exit(0)
+    # The command, execute, and compiler options file helps are handled before argparse. Otherwise, one would get an
+    # error because 'programdir' is a required argument but is missing. This way, the help can be printed anyway.
+    help_options = get_help_options(sys.argv[1:])
+    if help_options:
+        # All helps can be printed at once
+        if '--executefilehelp' in help_options:
+            print(strings.EXECUTE_FILE_HELP)
+        if '--commandfilehelp' in help_options:
+            print(strings.COMMAND_FILE_HELP)
+        if '--compileroptionsfilehelp' in help_options:
+            print(strings.COMPILER_OPTIONS_FILE_HELP)
+        # Exit if either one, any of the, or all helps have been printed. Nothing needs to be cleaned up at this point,
+        # so skip the interpreter shutdown
+        sys.stdout.flush()
+        os._exit(0)
+
+    # Only imported now, so that printing one of the helps above does not need argparse at all
+    import argparse
 
     # Main parser
     parser = argparse.ArgumentParser(description='Check the software quality of a C/C++ program\n\n'
@@ -55,9 +74,10 @@ def parse_arguments():
                                                  '  -e to specify a file that tells me how to execute your program\n'
                                                  'Example command line for a CMake-based C++ program:\n'
                                                  './softwipe.py -CM path/to/program -e path/to/executefile\n',
-                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+                                     formatter_class=argparse.RawDescriptionHelpFormatter, allow_abbrev=False)
 
-    parser.add_argument('programdir', help="the root directory of your target program")
+    # Made absolute right away, so that the rest of softwipe can use it as is
+    parser.add_argument('programdir', type=os.path.abspath, help="the root directory of your target program")
 
     c = parser.add_mutually_exclusive_group()
     c.add_argument('-c', '--cc', action='store_true', help='use C. This is the default option')
@@ -118,6 +138,10 @@ def parse_arguments():
                                                                'your assertion score if you only/mostly use custom '
                                                                'assertion functions rather than raw C ones')
 
+    parser.add_argument('--no-cache-tools', action='store_true', help='Always check whether all required tools are '
+                                                                      'installed instead of relying on the result of '
+                                                                      'a previous check')
+
     parser.add_argument('--allow-running-as-root', action='store_true', help='Do not print a warning if the user is '
                                                                              'root')
 
@@ -135,20 +159,54 @@ def parse_arguments():
     parser.add_argument('--exclude-clang-tidy', action='store_true', help='Excludes Clang-Tidy from the analysis')
 
     args = parser.parse_args()
+    normalize_arguments(args)
     return args
 
 
+def normalize_arguments(args):
+    """
+    Add the normalized values of the arguments to the args Namespace, so that the rest of softwipe does not have to
+    unpack them again: The single-value options (which argparse stores as one-element lists because of nargs=1) are
+    unpacked into plain values or None, and the build mode is determined.
+    :param args: The "args" Namespace as returned from the argument parser.
+    """
+    import util
+
+    args.execute_file = args.executefile[0] if args.executefile else None
+    args.command_file = args.commandfile[0] if args.commandfile else None
+    args.cmake_options_file = args.O[0] if args.O else None
+    # -x can be given multiple times, and each value can contain several comma separated paths
+    args.excludes = [path for value in itertools.chain.from_iterable(args.exclude or ()) for path in value.split(',')]
+    args.exclude_file = args.X[0] if args.X else None
+    args.user_paths = args.path[0] if args.path else None
+    args.custom_asserts = args.custom_assert[0].split(',') if args.custom_assert else None
+    args.badge_file = args.add_badge[0] if args.add_badge else None
+    args.build_mode = get_build_mode(args)
+
+    # Read the compiler options file once here, so every compilation can reuse its content
+    args.compiler_options = None
+    if args.compileroptionsfile and not args.exclude_compilation:
+        args.compiler_options = util.read_text(args.compileroptionsfile[0]).rstrip()
+
+
 def add_to_path_variable(paths):
     """
-    Add paths to the system PATH environment variable.
+    Add paths to the system PATH environment variable. Paths that already are in the PATH are skipped, and the PATH is
+    only written once.
     :param paths: A comma separated lst of paths to add.
     """
-    path_list = []
-    for path in paths.split(','):
-        path_list.append(path)
-
-    for path in path_list:
-        os.environ['PATH'] += os.pathsep + path
+    existing_path = os.environ.get('PATH', '')
+    existing = set(existing_path.split(os.pathsep))
+    new_paths = os.pathsep.join(path for path in dict.fromkeys(paths.split(',')) if path and path not in existing)
+
+    if new_paths:
+        path_value = existing_path + os.pathsep + new_paths if existing_path else new_paths
+        # The environment stores bytes, and os.environ is only a str wrapper around the same mapping, so write the
+        # encoded value directly where the platform has a bytes environment
+        if os.supports_bytes_environ:
+            os.environb[b'PATH'] = os.fsencode(path_value)
+        else:
+            os.environ['PATH'] = path_value
 
 
 def add_kwstyle_to_path_variable():
@@ -156,6 +214,9 @@ def add_kwstyle_to_path_variable():
     Adjusts the PATH variable by adding KWStyle to the PATH if it is contained in the softwipe directory (which it is
     if the user did the auto-installation of it).
     """
+    import automatic_tool_installation
+    import util
+
     kwstyle_dir = os.path.join(util.get_softwipe_directory(), 'KWStyle')
     if os.path.isdir(kwstyle_dir):
         add_to_path_variable(os.path.join(kwstyle_dir, strings.SOFTWIPE_BUILD_DIR_NAME))
@@ -166,6 +227,9 @@ def add_kwstyle_to_path_variable():
 
 
 def add_lizard_to_path_variable():
+    import automatic_tool_installation
+    import util
+
     # TODO: fix versioning
     lizard_dir = os.path.join(util.get_softwipe_directory(), 'lizard-1.17.7')
     if os.path.isdir(lizard_dir):
@@ -177,6 +241,9 @@ def add_lizard_to_path_variable():
 
 
 def add_infer_to_path_variable():
+    import automatic_tool_installation
+    import util
+
     # TODO: fix versioning
     infer_dir = os.path.join(util.get_softwipe_directory(), 'infer-linux64-v0.17.0')
     infer_dir = os.path.join(infer_dir, "lib/infer/infer/bin")
@@ -193,32 +260,80 @@ def add_user_paths_to_path_variable(args):
     Adjusts the PATH variable if necessary by adding user specified paths (if any were specified) to the PATH.
     :param args: The "args" Namespace as returned from parse_arguments().
     """
-    user_paths = args.path[0] if args.path else None
-    if user_paths:
-        add_to_path_variable(user_paths)
+    if args.user_paths:
+        add_to_path_variable(args.user_paths)
+
+
+@contextlib.contextmanager
+def _timeout(seconds):
+    """
+    Context manager that raises a TimeoutError in the main thread if its block runs for longer than 'seconds'. Where
+    SIGALRM is not available, the process is terminated instead.
+    :param seconds: The time limit in seconds.
+    """
+    if hasattr(signal, 'SIGALRM'):
+        def raise_timeout(signum, frame):
+            raise TimeoutError
+
+        previous_handler = signal.signal(signal.SIGALRM, raise_timeout)
+        signal.alarm(seconds)
+        try:
+            yield
+        finally:
+            signal.alarm(0)
+            signal.signal(signal.SIGALRM, previous_handler)
+    else:
+        timer = threading.Timer(seconds, os._exit, args=(1, ))
+        timer.daemon = True
+        timer.start()
+        try:
+            yield
+        finally:
+            timer.cancel()
 
 
 def warn_if_user_is_root():
     """
-    Check if the user is root, and print a warning if he is.
+    Check if the user is root, and print a warning if he is. Exits if the user does not answer within
+    _ROOT_PROMPT_TIMEOUT seconds (or there is no input at all), so unattended runs do not hang.
     """
-    if os.geteuid() == 0:  # if user is root
+    if _USER_IS_ROOT:
         print(strings.USER_IS_ROOT_WARNING)
-        while True:
-            user_in = input('>>> ')
-            if user_in in ('Y', 'Yes'):
-                print("Okay, running as root now!")
-                break
-            elif user_in in ('n', 'no'):
-                sys.exit(1)
-            else:
-                print('Please answer with "Y" (Yes) or "n" (no)!')
+        try:
+            with _timeout(_ROOT_PROMPT_TIMEOUT):
+                while True:
+                    user_in = input('>>> ')
+                    if user_in in _YES:
+                        print("Okay, running as root now!")
+                        break
+                    elif user_in in _NO:
+                        sys.exit(1)
+                    else:
+                        print('Please answer with "Y" (Yes) or "n" (no)!')
+        except (TimeoutError, EOFError):
+            print()
+            print(strings.USER_IS_ROOT_NO_ANSWER)
+            sys.exit(1)
+
+
+def get_build_mode(args):
+    """
+    Get the build mode selected via the command line. CMake is the default if neither make nor clang was chosen.
+    :param args: The "args" Namespace as returned from parse_arguments().
+    :return: 'make', 'clang', or 'cmake'.
+    """
+    if args.make:
+        return 'make'
+    if args.clang:
+        return 'clang'
+    return 'cmake'
 
 
-def compile_program(args, lines_of_code, cpp, compiler_flags, excluded_paths):
+def compile_program(args, program_dir_abs, lines_of_code, cpp, compiler_flags, excluded_paths):
     """
     Run the automatic compilation of the target project.
     :param args: The "args" Namespace as returned from parse_arguments().
+    :param program_dir_abs: The absolute path to the root directory of the target program.
     :param lines_of_code: The lines of pure code count.
     :param cpp: Whether C++ is used or not. True if C++, False if C.
     :param compiler_flags: The flags to be used for compilation. Typically, these should be strings.COMPILE_FLAGS or,
@@ -226,45 +341,22 @@ def compile_program(args, lines_of_code, cpp, compiler_flags, excluded_paths):
     :param excluded_paths: A tuple containing the paths to be excluded.
     :return: The compiler score.
     """
-    print(strings.RUN_COMPILER_HEADER)
-    program_dir_abs = os.path.abspath(args.programdir)
-    command_file = args.commandfile
+    import compile_phase
 
-    if args.O:
-        additional_args = open(args.O[0], 'r').read().rstrip().split()
-    else:
-        additional_args = []
-
-    if args.make:
-        if command_file:
-            score = compile_phase.compile_program_make(program_dir_abs, lines_of_code, compiler_flags, excluded_paths,
-                                                       make_command_file=command_file[0])
-        else:
-            score = compile_phase.compile_program_make(program_dir_abs, lines_of_code, compiler_flags, excluded_paths)
-    elif args.clang:
-        score = compile_phase.compile_program_clang(program_dir_abs, args.clang, lines_of_code, compiler_flags,
-                                                    excluded_paths, cpp)
-    else:
-        if command_file:
-            score = compile_phase.compile_program_cmake(program_dir_abs, lines_of_code, compiler_flags, excluded_paths,
-                                                        make_command_file=command_file[0],
-                                                        additional_args=additional_args)
-        else:
-            score = compile_phase.compile_program_cmake(program_dir_abs, lines_of_code, compiler_flags, excluded_paths,
-                                                        additional_args=additional_args)
-
-    return score
+    print(strings.RUN_COMPILER_HEADER, flush=True)
+    return compile_phase.compile_program(args, program_dir_abs, lines_of_code, cpp, compiler_flags, excluded_paths)
 
 
-def compile_program_with_infer(args, excluded_paths):
+def compile_program_with_infer(args, program_dir_abs, excluded_paths):
     """
     Calls Infer compilation functions depending on the arguments received.
     :param args: softwipe arguments
+    :param program_dir_abs: The absolute path to the root directory of the target program.
     :param excluded_paths: paths to exclude from infer analysis
     :return: true - if compilation successful
              false - if compilation is not successful
     """
-    program_dir_abs = os.path.abspath(args.programdir)
+    import compile_phase
 
     if args.cmake:
         infer_compilation_status = compile_phase.compile_program_infer_cmake(program_dir_abs, excluded_paths)
@@ -287,6 +379,8 @@ def execute_program(program_dir_abs, executefile, cmake, lines_of_code):
     :param lines_of_code: The lines of pure code count.
     :return The weighted sanitizer error count.
     """
+    import execution_phase
+
     try:
         weighted_error_count = execution_phase.run_execution(program_dir_abs, executefile, cmake, lines_of_code)
     except execution_phase.ExecutionFailedException:
@@ -307,16 +401,18 @@ def compile_and_execute_program_with_sanitizers(args, lines_of_code, program_dir
     :param no_exec: If True, skip execution of the program.
     :return The compiler + sanitizer score.
     """
+    import scoring
+
     compiler_flags = strings.COMPILER_WARNING_FLAGS if no_exec else strings.COMPILE_FLAGS
-    if args.compileroptionsfile:
-        options = open(args.compileroptionsfile[0], 'r').read().rstrip()
-        compiler_flags += " " + options
+    if args.compiler_options:
+        compiler_flags = '{} {}'.format(compiler_flags, args.compiler_options)
 
-    weighted_sum_of_compiler_warnings = compile_program(args, lines_of_code, cpp, compiler_flags, excluded_paths)
+    weighted_sum_of_compiler_warnings = compile_program(args, program_dir_abs, lines_of_code, cpp, compiler_flags,
+                                                        excluded_paths)
 
     if not no_exec:
-        execute_file = args.executefile[0] if args.executefile else None
-        weighted_sum_of_sanitizer_warnings = execute_program(program_dir_abs, execute_file, args.cmake, lines_of_code)
+        weighted_sum_of_sanitizer_warnings = execute_program(program_dir_abs, args.execute_file, args.cmake,
+                                                             lines_of_code)
     else:
         weighted_sum_of_sanitizer_warnings = 0
         print(strings.WARNING_PROGRAM_EXECUTION_SKIPPED)
@@ -331,41 +427,41 @@ def compile_and_execute_program_with_sanitizers(args, lines_of_code, program_dir
 def add_badge_to_file(path, overall_score):
     # TODO: Clean and test this function
     """
-    Experimental function to add a softwipe score badge to a github readme.
+    Experimental function to add a softwipe score badge to a github readme. If the readme already contains a softwipe
+    badge, its score gets updated. Otherwise, the badge is appended to the first line containing a badge, or inserted
+    after the first line if there are no badges at all.
     :param path: path of the readme file
     :param overall_score: softwipe score received by the project
     """
     badge_string = strings.BADGE_LINK.format(round(overall_score, 1))
 
-    lines = ""
-    output = ""
-    badge_set = False
-
     with open(path, 'r') as file:
-        for line in file:
-            lines += line
-
-    if "[![Softwipe Score]" in lines:
-        for line in lines.split("\n"):
-            if "[![Softwipe Score]" in line:
-                line = re.sub(r'\[!\[Softwipe Score\]\(([^\)\]]+)\)\]\(([^\)\]]+)\)', badge_string,
-                              line.rstrip()) + "\n"
-            output += line
-    elif "[![" in lines:
-        for line in lines.split("\n"):
-            if "[![" in line and not badge_set:
-                badge_set = True
-                line += badge_string
-            output += line
-    else:
-        for line in lines.split("\n"):
-            output += line
-            if not badge_set:
-                badge_set = True
-                output += badge_string + "\n"
+        text = file.read()
+
+    replaced_badges = 0
+    if _BADGE_SENTINEL in text:  # cheap substring check, so the regex only runs if there is a badge to update
+        output, replaced_badges = _SOFTWIPE_BADGE_RE.subn(badge_string, text)
+    if not replaced_badges:
+        first_badge_index = text.find("[![")
+        if first_badge_index != -1:
+            # Append the badge to the end of the line with the first badge
+            line_end = text.find("\n", first_badge_index)
+            if line_end == -1:
+                line_end = len(text)
+            output = text[:line_end] + badge_string + text[line_end:]
+        else:
+            # Insert the badge as a new line after the first line
+            first_line_end = text.find("\n")
+            if first_line_end == -1:
+                output = text + ("\n" if text else "") + badge_string + "\n"
+            else:
+                output = text[:first_line_end + 1] + badge_string + "\n" + text[first_line_end + 1:]
 
-    with open(path, 'w') as modified:
+    # Write to a temporary file first and then replace the readme, so that it never ends up half written
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as modified:
         modified.write(output)
+    os.replace(tmp_path, path)
 
 
 def main():
@@ -378,17 +474,24 @@ def main():
     # Allow the user to auto-install the dependencies by just running "./softwipe.py" without any arguments
     # Should not be needed if conda is used. TODO: maybe remove this
     if len(sys.argv) == 1:
+        import automatic_tool_installation
         automatic_tool_installation.check_if_all_required_tools_are_installed()
 
     args = parse_arguments()
 
-    for argument in sys.argv:
-        print(argument, end=" ")
-    print()
+    import concurrent.futures
+    import subprocess
+    import automatic_tool_installation
+    import util
+
+    program_dir_abs = args.programdir
+    excluded_paths = util.get_excluded_paths(program_dir_abs, args.excludes, args.exclude_file)
+
+    print(" ".join(shlex.quote(argument) for argument in sys.argv))
 
     # Normal check for the dependencies
     if len(sys.argv) != 1:
-        automatic_tool_installation.check_if_all_required_tools_are_installed()
+        automatic_tool_installation.check_if_all_required_tools_are_installed(use_cache=not args.no_cache_tools)
 
     # if args.use_infer:
     #    add_infer_to_path_variable()
@@ -398,24 +501,22 @@ def main():
     if not args.allow_running_as_root:
         warn_if_user_is_root()
 
+    # Finding the source files and counting their lines only reads the program directory, so it runs in the background
+    # while the remaining (expensive) modules are imported. It is only started after the checks above, which may exit.
+    setup_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    walk_future = setup_executor.submit(util.walk_and_count, program_dir_abs, excluded_paths)
+    setup_executor.shutdown(wait=False)
+
+    import scoring
+    from analysis_tools import CppcheckTool, ClangTidyTool, KWStyleTool, LizardTool, AssertionTool, InferTool, \
+        TestCountTool
+
     use_cpp = args.cpp
     use_cmake = args.cmake
     use_make = args.make
-    program_dir_abs = os.path.abspath(args.programdir)
-    if args.exclude:
-        exclude = list(itertools.chain.from_iterable(args.exclude))
-        exclude = ",".join(exclude)
-    else:
-        exclude = None
 
-    exclude_file = args.X[0] if args.X else None
-    excluded_paths = util.get_excluded_paths(program_dir_abs, exclude, exclude_file)
-    custom_asserts = args.custom_assert[0].split(',') if args.custom_assert else None
+    source_files, lines_of_code, lines_of_test_code = walk_future.result()
 
-    source_files = util.find_all_source_files(program_dir_abs, excluded_paths)
-    lines_of_code = util.count_lines_of_code(source_files)
-
-    analysis_tools = []  # TODO: maybe add valgrind at some point if we get its error counts normalized somehow
     all_scores = []
 
     data = {"program_dir_abs": program_dir_abs,
@@ -424,57 +525,89 @@ def main():
             "use_cpp": use_cpp,
             "use_cmake": use_cmake,
             "use_make": use_make,
-            "custom_asserts": custom_asserts,
+            "custom_asserts": args.custom_asserts,
             "source_files": source_files,
             "lines_of_code": lines_of_code,
+            "lines_of_test_code": lines_of_test_code,
             "executefile": args.executefile
             }
 
-    """t1 = time.perf_counter()"""
-
-    if not args.exclude_compilation:
-        compiler_and_sanitizer_score = compile_and_execute_program_with_sanitizers(
-            args, lines_of_code, program_dir_abs, use_cpp, excluded_paths, args.no_execution)
-        all_scores.append(compiler_and_sanitizer_score)
-        if args.use_infer:      # TODO: maybe completely remove Infer since it requires a lot of disk space
-            add_infer_to_path_variable()
-            analysis_tools.append(InferTool)
+    # Each tool together with whether it is excluded from the analysis. The order of this table is the order in which
+    # the tools are started (apart from those that wait for the compilation) and in which their results are printed.
+    # TODO: maybe add valgrind at some point if we get its error counts normalized somehow
+    # TODO: maybe completely remove Infer since it requires a lot of disk space
+    tool_table = ((InferTool, args.exclude_compilation or not args.use_infer),
+                  (AssertionTool, args.exclude_assertions),
+                  (ClangTidyTool, args.exclude_clang_tidy),
+                  (CppcheckTool, args.exclude_cppcheck),
+                  (LizardTool, args.exclude_lizard),
+                  (KWStyleTool, args.exclude_kwstyle),
+                  (TestCountTool, False))
+    analysis_tools = [tool for tool, excluded in tool_table if not excluded]
+
+    if InferTool in analysis_tools:
+        add_infer_to_path_variable()
+
+    # The tools only wait for their subprocesses, so threads are sufficient to run them in parallel. One more worker is
+    # needed for the compilation.
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(analysis_tools) + 1)
+    futures = {}
+
+    # Clang-tidy needs the compilation database that is created by the compilation. Infer needs to wait for the
+    # compilation as well, unless cmake is used: Then, Infer builds in its own build directory, so its compilation can
+    # run alongside ours. With make, both would build in the program directory. All other tools only read the source
+    # files, so they can run while the program is compiled.
+    tools_after_compilation = [ClangTidyTool]
+    if not use_cmake:
+        tools_after_compilation.append(InferTool)
 
-    """t2 = time.perf_counter()
-    print("Compilation time: {}s".format(t2 - t1))
-    sys.exit()"""
-
-    if not args.exclude_assertions:
-        analysis_tools.append(AssertionTool)
-    if not args.exclude_clang_tidy:
-        analysis_tools.append(ClangTidyTool)
-    if not args.exclude_cppcheck:
-        analysis_tools.append(CppcheckTool)
-    if not args.exclude_lizard:
-        analysis_tools.append(LizardTool)
-    if not args.exclude_kwstyle:
-        analysis_tools.append(KWStyleTool)
-    analysis_tools.append(TestCountTool)
-
-    thread_pool = ThreadPool(processes=len(analysis_tools))
-    instances = []
-    outs = []
-
-    """t1 = time.perf_counter()"""
-
-    for i in range(len(analysis_tools)):
-        instances.append(thread_pool.apply_async(analysis_tools[i].run, (data, )))
-
-    for i in range(len(instances)):
-        outs.append(instances[i].get())
-
-    for i in range(len(outs)):
-        scores, log, success = outs[i]
-        if success:
-            print(log)
-            all_scores.extend(scores)
-        else:
-            print("excluded {} from analysis\n".format(analysis_tools[i].name()))
+    try:
+        for tool in analysis_tools:
+            if tool not in tools_after_compilation:
+                futures[tool] = executor.submit(tool.run, data)
+
+        """t1 = time.perf_counter()"""
+
+        if not args.exclude_compilation:
+            compilation_future = executor.submit(compile_and_execute_program_with_sanitizers, args, lines_of_code,
+                                                 program_dir_abs, use_cpp, excluded_paths, args.no_execution)
+            # Wait for the compilation before printing any tool results, so the compiler output does not get mixed up
+            # with them
+            compiler_and_sanitizer_score = compilation_future.result()
+            all_scores.append(compiler_and_sanitizer_score)
+
+        """t2 = time.perf_counter()
+        print("Compilation time: {}s".format(t2 - t1))
+        sys.exit()"""
+
+        """t1 = time.perf_counter()"""
+
+        for tool in analysis_tools:
+            if tool in tools_after_compilation:
+                futures[tool] = executor.submit(tool.run, data)
+
+        # Print the results in the order of the tool table, so every run prints them in the same order. The tools still
+        # run concurrently. Each result is written in one go. The tools do not print anything themselves, also not
+        # when they fail, so their output cannot get mixed up with the compiler output.
+        for tool in analysis_tools:
+            try:
+                result = futures[tool].result()
+            except subprocess.CalledProcessError as error:
+                sys.stdout.write(strings.COMPILATION_CRASHED.format(error.returncode, error.output) + '\n')
+                raise
+            if result.success:
+                sys.stdout.write(result.log + '\n')
+                all_scores.extend(result.scores)
+            else:
+                sys.stdout.write(result.log + "excluded {} from analysis\n\n".format(tool.name()))
+    except BaseException:
+        # Cancel the tools that have not started yet and do not wait for the others before passing on the error. (The
+        # cancel_futures argument of shutdown() is not used, as it needs Python 3.9.)
+        for future in futures.values():
+            future.cancel()
+        executor.shutdown(wait=False)
+        raise
+    executor.shutdown()
 
     """t2 = time.perf_counter()
     print("Time static analysis: {}s".format(t2 - t1))"""
@@ -483,9 +616,11 @@ def main():
 
     scoring.print_score(overall_score, 'Overall program absolute')
 
-    if args.add_badge:
-        add_badge_to_file(args.add_badge[0], overall_score)
-        print("Added badge to file {}".format(args.add_badge[0]))
+    if args.badge_file:
+        add_badge_to_file(args.badge_file, overall_score)
+        print("Added badge to file {}".format(args.badge_file))
+
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
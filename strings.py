@@ -116,6 +116,9 @@ USER_IS_ROOT_WARNING = 'You are running as root! This will cause my output files
                        'continue as root if necessary.\n' \
                        'Do you want to continue as root? (Y/n)'
 
+USER_IS_ROOT_NO_ANSWER = 'Did not get an answer, exiting. Use --allow-running-as-root to run as root without being ' \
+                         'asked.'
+
 WARNING_PROGRAM_EXECUTION_SKIPPED = 'Warning: Program execution was skipped. Thus, clang sanitizer results are not ' \
                                     'available.'
 
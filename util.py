@@ -2,7 +2,12 @@
 This module contains utility functions.
 """
 
+import atexit
+import concurrent.futures
+import functools
 import os
+import re
+import tempfile
 import strings
 import shutil
 
@@ -32,10 +37,7 @@ def write_into_file_list(file_name, content, append=False):
     :param content: lst of elements to write into file. The elements will be used like strings.
     :param append: bool telling to overwrite the file or append to file
     """
-    content_as_string = ''
-    for line in content:
-        content_as_string += line
-        content_as_string += '\n'
+    content_as_string = ''.join(line + '\n' for line in content)
     write_into_file_string(file_name, content_as_string, append)
 
 
@@ -48,11 +50,27 @@ def print_lines(lines):
         print(line)
 
 
+@functools.lru_cache(maxsize=32)
+def _read_text(path, mtime):
+    with open(path, 'r') as file:
+        return file.read()
+
+
+def read_text(path):
+    """
+    Read a whole text file. The content is cached for as long as the modification time of the file does not change,
+    so files that are needed several times (e.g. the execute file) are only read once.
+    :param path: The path to the file.
+    :return: The content of the file.
+    """
+    return _read_text(path, os.path.getmtime(path))
+
+
 def get_excluded_paths(program_dir_abs, exclude, exclude_file_path=None):
     """
     Return the paths (files and dirs) that should be excluded from being analyzed by softwipe.
     :param program_dir_abs: The absolute path to the root directory of the program.
-    :param exclude: A comma separated list of files and directories to exclude, as given via command line (-x option).
+    :param exclude: A list of files and directories to exclude, as given via command line (-x option).
     :param exclude_file_path: A file containing a list of files and directories to exclude, each noted
                     in a separate line.
     :return: A tuple containing all excluded paths.
@@ -62,8 +80,7 @@ def get_excluded_paths(program_dir_abs, exclude, exclude_file_path=None):
                       os.path.join(program_dir_abs, strings.SOFTWIPE_BUILD_DIR_NAME),
                       os.path.join(program_dir_abs, strings.INFER_BUILD_DIR_NAME))
     if exclude:
-        for path in exclude.split(','):
-            excluded_paths += (os.path.join(program_dir_abs, path),)
+        excluded_paths += tuple(os.path.join(program_dir_abs, path) for path in exclude)
 
     try:
         if exclude_file_path:
@@ -77,33 +94,103 @@ def get_excluded_paths(program_dir_abs, exclude, exclude_file_path=None):
     except Exception as e:
         print(e)
 
-    return excluded_paths
+    # Drop duplicates, so that the prefix checks against the excluded paths do not test the same path twice
+    return tuple(dict.fromkeys(excluded_paths))
 
 
-def find_all_source_files(program_dir_abs, excluded_paths):
+@functools.lru_cache(maxsize=8)
+def get_excluded_paths_regex(excluded_paths):
     """
-    Find all source files in program_dir_abs. Traverses the directory recursively and returns all source files,
-    i.e. all *.c or *.cpp or *.h or *.hpp files.
+    Compile a single regex that matches any of the excluded paths, so that checking a line for excluded paths only
+    needs one search instead of one substring check per path.
+    :param excluded_paths: A tuple containing the paths to be excluded, as returned by get_excluded_paths().
+    :return: The compiled regex, or None if there are no excluded paths.
+    """
+    if not excluded_paths:
+        return None
+    return re.compile('|'.join(re.escape(path) for path in excluded_paths))
+
+
+def iterate_source_files(program_dir_abs, excluded_paths):
+    """
+    Find all source files in program_dir_abs, i.e. all *.c or *.cpp or *.h or *.hpp files. Traverses the directory
+    recursively and yields the source files while the directory is traversed.
     :param program_dir_abs: The absolute path to the root directory of the program.
     :param excluded_paths: A tuple containing the paths to be excluded. The tuple should be obtained via the
     get_excluded_paths() function.
-    :return: A lst containing absolute paths to all source files.
+    :return: A generator yielding the absolute paths to all source files.
     """
-    source_files = []
+    if program_dir_abs.startswith(excluded_paths):
+        return
+
     source_file_endings = ('.c', '.cc', '.cpp', '.cxx', '.h', '.hpp')
 
-    for dirpath, _, files in os.walk(program_dir_abs):
-        if dirpath.startswith(excluded_paths):
+    # Walks the tree top-down like os.walk() does, but works on the os.scandir() entries directly: The entries already
+    # know whether they are directories and carry their full path, so no extra stat or path join is needed per file.
+    directories = [program_dir_abs]
+    while directories:
+        directory = directories.pop()
+        try:
+            with os.scandir(directory) as entries:
+                subdirectories = []
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # Like os.walk(), do not follow symlinks to directories. Excluded directories are not
+                        # descended into at all, since everything below them would be excluded anyway.
+                        if not entry.is_symlink() and not entry.path.startswith(excluded_paths):
+                            subdirectories.append(entry.path)
+                    elif entry.name.endswith(source_file_endings) and not entry.path.startswith(excluded_paths):
+                        yield entry.path
+        except OSError:
             continue
+        # Reversed, so that the subdirectories are popped in the order in which they were listed
+        directories.extend(reversed(subdirectories))
 
-        for file in files:
-            file_abspath = os.path.join(dirpath, file)
-            if file_abspath.startswith(excluded_paths):
-                continue
-            if file.endswith(source_file_endings):
-                source_files.append(os.path.join(dirpath, file))
 
-    return source_files
+def walk_and_count(program_dir_abs, excluded_paths):
+    """
+    Find all source files and count their lines of code in one go. The files are counted in a thread pool while the
+    directory is still being traversed, so that reading the files overlaps with the traversal and with each other.
+    :param program_dir_abs: The absolute path to the root directory of the program.
+    :param excluded_paths: A tuple containing the paths to be excluded.
+    :return: 1. A tuple containing absolute paths to all source files.
+             2. The lines of code count of all these files.
+             3. The lines of code count of the test files among them, i.e. the files for which is_testfile() is True.
+    """
+    source_files = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = []
+        test_futures = []
+        for source_file in iterate_source_files(program_dir_abs, excluded_paths):
+            source_files.append(source_file)
+            future = executor.submit(count_lines_of_code_in_one_file, source_file)
+            futures.append(future)
+            if is_testfile(source_file):
+                test_futures.append(future)
+        lines_of_code = sum(future.result() for future in futures)
+        lines_of_test_code = sum(future.result() for future in test_futures)
+
+    return tuple(source_files), lines_of_code, lines_of_test_code
+
+
+@functools.lru_cache(maxsize=8)
+def get_file_list_file(files):
+    """
+    Write a list of files into a temporary file, one path per line, for tools that can read their input files from a
+    file (like cppcheck's --file-list). This avoids too long command lines. The file is only written once per list and
+    gets removed when softwipe exits.
+    :param files: A tuple of file paths, e.g. the source files as returned by walk_and_count().
+    :return: The path to the temporary file.
+    """
+    fd, path = tempfile.mkstemp(prefix='softwipe_', suffix='.txt')
+    with os.fdopen(fd, 'w') as file:
+        file.write(''.join(file_path + '\n' for file_path in files))
+    atexit.register(os.remove, path)
+    return path
 
 
 def line_is_empty(line):
@@ -138,6 +225,16 @@ def line_is_comment(line, block_comment_has_started):
     return is_comment, block_comment_has_started
 
 
+def read_source_file_lines(file):
+    """
+    Read the lines of a source file, as used by the lines of code counting and the assertion check.
+    :param file: The path to the source file.
+    :return: A list containing the lines of the file, without line endings.
+    """
+    with open(file, 'r', encoding='latin-1') as f:
+        return f.read().split('\n')
+
+
 def count_lines_of_code_in_one_file(file):
     """
     Count the lines of code in one file. Ignores blank and comment lines.
@@ -146,7 +243,7 @@ def count_lines_of_code_in_one_file(file):
     """
     lines_of_code = 0
 
-    file_lines = open(file, 'r', encoding='latin-1').readlines()
+    file_lines = read_source_file_lines(file)
     block_comment_has_started = False
     for line in file_lines:
         is_comment, block_comment_has_started = line_is_comment(line, block_comment_has_started)
@@ -157,23 +254,10 @@ def count_lines_of_code_in_one_file(file):
     return lines_of_code
 
 
-def count_lines_of_code(source_files):
-    """
-    Count the lines of code in source files. Ignores blank and comment lines.
-    :param source_files: The lst of files to count lines in.
-    :return: The count of total non-empty, non-comment code lines in the files.
-    """
-    lines_of_code = 0
-
-    for file in source_files:
-        lines_of_code += count_lines_of_code_in_one_file(file)
-
-    return lines_of_code
-
-
+@functools.lru_cache(maxsize=None)
 def get_softwipe_directory():
     """
-    Get the directory where softwipe is located.
+    Get the directory where softwipe is located. The directory is only resolved on the first call.
     :return: The softwipe directory.
     """
     return os.path.dirname(os.path.realpath(__file__))